@@ -0,0 +1,87 @@
+import heapq
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.buff_id import BuffId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.unit import Unit
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+CHRONO_ENERGY: float = 50.0
+
+
+@dataclass
+class ChronoScheduler:
+    """Chrono boost targets of some structure types, cheapest first.
+
+    The set of ready structures to consider is kept up to date from
+    structure events, so nothing scans `ai.structures` per step. Candidates
+    are only ranked, in a heap keyed on current order progress, on steps
+    where a Nexus has the energy to chrono.
+
+    Attributes
+    ----------
+    target_types : set[UnitTypeId]
+        Structure types worth boosting.
+    max_progress : float
+        Orders further along than this are not worth boosting.
+    tags : set[int]
+        Ready structures of `target_types`.
+    """
+
+    target_types: set[UnitTypeId]
+    max_progress: float = 0.7
+    tags: set[int] = field(default_factory=set)
+
+    @classmethod
+    def build(
+        cls,
+        target_types: set[UnitTypeId],
+        structures: Iterable[Unit],
+        max_progress: float = 0.7,
+    ) -> "ChronoScheduler":
+        scheduler: ChronoScheduler = cls(set(target_types), max_progress)
+        for structure in structures:
+            scheduler.add(structure)
+        return scheduler
+
+    def add(self, structure: Unit) -> None:
+        if structure.is_ready and structure.type_id in self.target_types:
+            self.tags.add(structure.tag)
+
+    def remove(self, tag: int) -> None:
+        self.tags.discard(tag)
+
+    def boost(self, ai: "AresBot") -> None:
+        """Pair every Nexus with chrono energy with the best target left."""
+        if not (
+            nexuses := [
+                th for th in ai.townhalls if th.energy >= CHRONO_ENERGY and th.is_ready
+            ]
+        ):
+            return
+
+        queue: list[tuple[float, int]] = []
+        for tag in list(self.tags):
+            structure: Unit | None = ai.unit_tag_dict.get(tag)
+            # gone, or morphed into something else
+            if not structure or structure.type_id not in self.target_types:
+                self.tags.discard(tag)
+                continue
+            if (
+                structure.orders
+                and structure.orders[0].progress < self.max_progress
+                and not structure.has_buff(BuffId.CHRONOBOOSTENERGYCOST)
+                and structure.is_powered
+            ):
+                queue.append((structure.orders[0].progress, tag))
+
+        heapq.heapify(queue)
+        for nexus in nexuses:
+            if not queue:
+                break
+            _, tag = heapq.heappop(queue)
+            nexus(AbilityId.EFFECT_CHRONOBOOSTENERGYCOST, ai.unit_tag_dict[tag])
@@ -6,27 +6,38 @@ from ares.behaviors.combat import CombatManeuver
 from ares.behaviors.combat.individual import (
     AMove,
     AttackTarget,
-    KeepUnitSafe,
-    PathUnitToTarget,
     ShootTargetInRange,
     StutterUnitBack,
 )
-from ares.consts import ALL_STRUCTURES
 from ares.managers.manager_mediator import ManagerMediator
 from cython_extensions import (
     cy_attack_ready,
     cy_center,
-    cy_closest_to,
-    cy_distance_to,
     cy_in_attack_range,
 )
-from cython_extensions.geometry import cy_distance_to_squared
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.combat.base_combat import BaseCombat
+from bot.combat.enemy_snapshot import (
+    CAN_ATTACK_AIR,
+    FLYING,
+    STRUCTURE,
+    TARGETABLE,
+    EnemySnapshot,
+)
+from bot.combat.grid_snapshot import GridKind, GridSnapshot
+from bot.combat.keep_unit_safe_shared import KeepUnitSafeShared
+from bot.combat.path_unit_to_target_shared import PathUnitToTargetShared
+from bot.combat.range_matrix import (
+    distance_matrix,
+    in_weapon_range_matrix,
+    pick_threat_targets,
+    unit_weapon_arrays,
+)
+from bot.combat.target_assignment import assign_targets
 
 if TYPE_CHECKING:
     from ares import AresBot
@@ -38,6 +49,7 @@ DANGER_TO_AIR: set[UnitID] = {
     UnitID.SPORECRAWLER,
     UnitID.BUNKER,
 }
+DANGER_TO_AIR_IDS: np.ndarray = np.array([t.value for t in DANGER_TO_AIR])
 
 
 @dataclass
@@ -63,68 +75,60 @@ class AirCombat(BaseCombat):
         target: Point2 = (
             kwargs["target"] if "target" in kwargs else self.ai.enemy_start_locations[0]
         )
-        avoid_grid: np.ndarray = self.mediator.get_air_avoidance_grid
-        grid: np.ndarray = self.mediator.get_air_grid
-
-        close_enemy: list[Unit] = [
-            u
-            for u in close_enemy
-            if (not u.is_cloaked or u.is_cloaked and u.is_revealed)
-            and (not u.is_burrowed or u.is_burrowed and u.is_visible)
-            and not u.is_memory
-            and not u.is_snapshot
-        ]
+        grids: GridSnapshot = self.ai.grid_snapshot
+        grid: np.ndarray = grids.grid(GridKind.AIR)
 
-        only_enemy_units: list[Unit] = [
-            u for u in close_enemy if u.type_id not in ALL_STRUCTURES
-        ]
+        snapshot: EnemySnapshot = self.ai.enemy_snapshot
+        close_idx: np.ndarray = snapshot.select(
+            snapshot.indices_of(close_enemy), require=TARGETABLE
+        )
+        close_enemy: list[Unit] = snapshot.units_at(close_idx)
+        only_enemy_units: list[Unit] = snapshot.units_at(
+            snapshot.select(close_idx, exclude=STRUCTURE)
+        )
 
         close_batteries: list[Unit] = [
             s
-            for s in self.ai.structures
-            if s.type_id == UnitID.SHIELDBATTERY
-            and s.is_powered
-            and cy_distance_to_squared(s.position, cy_center(units)) < 400.0
+            for s in self.ai.structure_index.in_range(
+                UnitID.SHIELDBATTERY, cy_center(units), 20.0
+            )
+            if s.is_powered
         ]
 
-        for unit in units:
+        units = list(units)
+        threat_targets: np.ndarray
+        danger_units: list[Unit]
+        threat_targets, danger_units = self._threat_targets(units, snapshot, close_idx)
+        assigned_targets: list[Unit | None] = assign_targets(units, close_enemy)
+
+        for i, unit in enumerate(units):
             type_id: UnitID = unit.type_id
             attacking_maneuver: CombatManeuver = CombatManeuver()
-            attacking_maneuver.add(KeepUnitSafe(unit=unit, grid=avoid_grid))
+            attacking_maneuver.add(
+                KeepUnitSafeShared(unit, grids, GridKind.AIR_AVOIDANCE)
+            )
             if len(close_batteries) > 0 and unit.shield_percentage < 0.25:
                 target_battery: Unit = max(
                     close_batteries, key=lambda b: b.energy, default=close_batteries[0]
                 )
                 attacking_maneuver.add(
-                    PathUnitToTarget(
-                        unit=unit,
-                        target=target_battery.position,
-                        grid=grid,
+                    PathUnitToTargetShared(
+                        unit,
+                        grids,
+                        GridKind.AIR,
+                        target_battery.position,
                         success_at_distance=4.0,
                     )
                 )
-                attacking_maneuver.add(KeepUnitSafe(unit=unit, grid=grid))
+                attacking_maneuver.add(KeepUnitSafeShared(unit, grids, GridKind.AIR))
                 self.ai.register_behavior(attacking_maneuver)
                 continue
 
             # if in range of anything that can harm tempests
             # shoot them
-            if danger_to_air := [
-                u
-                for u in close_enemy
-                if (u.can_attack_air or u.type_id in DANGER_TO_AIR)
-                and cy_distance_to(u.position, unit.position)
-                <= (
-                    (unit.ground_range if not u.is_flying else unit.air_range)
-                    + unit.radius
-                    + u.radius
-                )
-            ]:
-                if f_danger := [e for e in danger_to_air if e.is_flying]:
-                    e_target: Unit = cy_closest_to(unit.position, f_danger)
-                else:
-                    e_target: Unit = cy_closest_to(unit.position, danger_to_air)
-                if e_target and cy_attack_ready(self.ai, unit, e_target):
+            if (threat := threat_targets[i]) >= 0:
+                e_target: Unit = danger_units[threat]
+                if cy_attack_ready(self.ai, unit, e_target):
                     attacking_maneuver.add(AttackTarget(unit=unit, target=e_target))
 
             # attack any units in range
@@ -146,7 +150,7 @@ class AirCombat(BaseCombat):
                     attacking_maneuver.add(
                         StutterUnitBack(
                             unit=unit,
-                            target=cy_closest_to(unit.position, close_enemy),
+                            target=assigned_targets[i],
                             grid=grid,
                         )
                     )
@@ -155,3 +159,40 @@ class AirCombat(BaseCombat):
                 attacking_maneuver.add(AMove(unit=unit, target=target))
 
             self.ai.register_behavior(attacking_maneuver)
+
+    @staticmethod
+    def _threat_targets(
+        units: list[Unit], snapshot: EnemySnapshot, close_idx: np.ndarray
+    ) -> tuple[np.ndarray, list[Unit]]:
+        """Pick a threat to air for every unit from one units x enemies matrix.
+
+        Returns
+        -------
+        tuple[np.ndarray, list[Unit]]
+            Index into the returned enemy list per unit (-1 if no threat in
+            range), and the enemies that are a danger to air.
+        """
+        danger_idx: np.ndarray = close_idx[
+            ((snapshot.flags[close_idx] & CAN_ATTACK_AIR) != 0)
+            | np.isin(snapshot.type_ids[close_idx], DANGER_TO_AIR_IDS)
+        ]
+        if len(danger_idx) == 0:
+            return np.full(len(units), -1, dtype=np.intp), []
+
+        enemy_flying: np.ndarray = (snapshot.flags[danger_idx] & FLYING) != 0
+        positions, radii, ground_ranges, air_ranges = unit_weapon_arrays(units)
+        distances: np.ndarray = distance_matrix(
+            positions, snapshot.positions[danger_idx]
+        )
+        in_range: np.ndarray = in_weapon_range_matrix(
+            distances,
+            radii,
+            ground_ranges,
+            air_ranges,
+            snapshot.radii[danger_idx],
+            enemy_flying,
+        )
+        return (
+            pick_threat_targets(distances, in_range, enemy_flying),
+            snapshot.units_at(danger_idx),
+        )
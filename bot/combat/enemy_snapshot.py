@@ -0,0 +1,136 @@
+from dataclasses import dataclass, field
+from typing import Iterable
+
+import numpy as np
+from ares.consts import ALL_STRUCTURES
+from sc2.unit import Unit
+
+from bot.consts import COMMON_UNIT_IGNORE_TYPES
+
+# flag bits stored per enemy in `EnemySnapshot.flags`
+TARGETABLE: int = 1 << 0
+STRUCTURE: int = 1 << 1
+FLYING: int = 1 << 2
+IGNORED_TYPE: int = 1 << 3
+CAN_ATTACK_AIR: int = 1 << 4
+
+
+def _unit_flags(unit: Unit) -> int:
+    flags: int = 0
+    if (
+        (not unit.is_cloaked or unit.is_cloaked and unit.is_revealed)
+        and (not unit.is_burrowed or unit.is_burrowed and unit.is_visible)
+        and not unit.is_memory
+        and not unit.is_snapshot
+    ):
+        flags |= TARGETABLE
+    type_id = unit.type_id
+    if type_id in ALL_STRUCTURES:
+        flags |= STRUCTURE
+    if type_id in COMMON_UNIT_IGNORE_TYPES:
+        flags |= IGNORED_TYPE
+    if unit.is_flying:
+        flags |= FLYING
+    if unit.can_attack_air:
+        flags |= CAN_ATTACK_AIR
+    return flags
+
+
+@dataclass
+class EnemySnapshot:
+    """Struct-of-arrays view over enemy units for a single game loop.
+
+    Built once per frame and shared between all combat classes, so the
+    visibility / structure filtering is done once rather than per squad.
+    Row `i` of every array refers to `units[i]`.
+
+    Parameters
+    ----------
+    game_loop : int
+        The game loop this snapshot was built on.
+    units : list[Unit]
+        Enemy units, row order matches the arrays.
+    positions : np.ndarray
+        (n, 2) array of unit positions.
+    radii : np.ndarray
+        Unit radii.
+    type_ids : np.ndarray
+        `UnitTypeId` values.
+    flags : np.ndarray
+        Bit flags, see module level constants.
+    """
+
+    game_loop: int
+    units: list[Unit]
+    positions: np.ndarray
+    radii: np.ndarray
+    type_ids: np.ndarray
+    flags: np.ndarray
+    tag_to_index: dict[int, int] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, units: Iterable[Unit], game_loop: int) -> "EnemySnapshot":
+        units = list(units)
+        snapshot = cls(
+            game_loop=game_loop,
+            units=[],
+            positions=np.empty((0, 2), dtype=np.float64),
+            radii=np.empty(0, dtype=np.float64),
+            type_ids=np.empty(0, dtype=np.int32),
+            flags=np.empty(0, dtype=np.int32),
+        )
+        snapshot._append(units)
+        return snapshot
+
+    def _append(self, units: list[Unit]) -> None:
+        if not units:
+            return
+        offset: int = len(self.units)
+        self.units.extend(units)
+        self.positions = np.concatenate(
+            (
+                self.positions,
+                np.array([u.position for u in units], dtype=np.float64),
+            )
+        )
+        self.radii = np.concatenate(
+            (self.radii, np.array([u.radius for u in units], dtype=np.float64))
+        )
+        self.type_ids = np.concatenate(
+            (self.type_ids, np.array([u.type_id.value for u in units], dtype=np.int32))
+        )
+        self.flags = np.concatenate(
+            (self.flags, np.array([_unit_flags(u) for u in units], dtype=np.int32))
+        )
+        for i, unit in enumerate(units):
+            self.tag_to_index[unit.tag] = offset + i
+
+    def indices_of(self, units: Iterable[Unit]) -> np.ndarray:
+        """Row indices for `units`.
+
+        Units not yet in the snapshot (eg. memory units returned from
+        a unit tree query) are appended so they get flags too.
+        """
+        units = list(units)
+        missing: list[Unit] = [u for u in units if u.tag not in self.tag_to_index]
+        if missing:
+            # a unit may appear more than once in `missing`
+            self._append(list({u.tag: u for u in missing}.values()))
+        tag_to_index: dict[int, int] = self.tag_to_index
+        return np.fromiter(
+            (tag_to_index[u.tag] for u in units), dtype=np.intp, count=len(units)
+        )
+
+    def select(
+        self, indices: np.ndarray, require: int = 0, exclude: int = 0
+    ) -> np.ndarray:
+        """Filter `indices` to rows with all `require` bits and no `exclude` bits."""
+        flags: np.ndarray = self.flags[indices]
+        mask: np.ndarray = (flags & require) == require
+        if exclude:
+            mask &= (flags & exclude) == 0
+        return indices[mask]
+
+    def units_at(self, indices: np.ndarray) -> list[Unit]:
+        units: list[Unit] = self.units
+        return [units[i] for i in indices]
@@ -0,0 +1,94 @@
+from typing import Sequence
+
+import numpy as np
+from sc2.position import Point2
+from scipy.ndimage import distance_transform_edt
+
+
+def _cells(positions: Sequence[Point2] | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    cells: np.ndarray = np.floor(
+        np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    ).astype(np.intp)
+    return cells[:, 0], cells[:, 1]
+
+
+def positions_safe(
+    grid: np.ndarray,
+    positions: Sequence[Point2] | np.ndarray,
+    weight_safety_limit: float = 1.0,
+) -> np.ndarray:
+    """Batched `mediator.is_position_safe`, one fancy index over the grid.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        Ares pathing grid, indexed [x, y].
+    positions : Sequence[Point2] | np.ndarray
+        Positions to check.
+    weight_safety_limit : float
+        Cells with a weight at or below this are safe.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array, True where the position is safe.
+    """
+    if len(positions) == 0:
+        return np.zeros(0, dtype=bool)
+    xs, ys = _cells(positions)
+    weights: np.ndarray = grid[xs, ys]
+    # np.inf is a pathing blocker rather than danger, same as Ares
+    return np.isinf(weights) | (weights <= weight_safety_limit)
+
+
+def closest_safe_spots(
+    grid: np.ndarray,
+    positions: Sequence[Point2] | np.ndarray,
+    radius: float = 15.0,
+    weight_safety_limit: float = 1.0,
+) -> list[Point2 | None]:
+    """Batched `mediator.find_closest_safe_spot`.
+
+    Runs one distance transform over the window of the grid covering all
+    `positions` (plus `radius`) and reads every answer from it.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        Ares pathing grid, indexed [x, y].
+    positions : Sequence[Point2] | np.ndarray
+        Positions to find safe spots for.
+    radius : float
+        Only return spots within this distance.
+    weight_safety_limit : float
+        Cells with a weight at or below this are safe.
+
+    Returns
+    -------
+    list[Point2 | None]
+        Closest safe cell per position, or None if there is none within
+        `radius`.
+    """
+    if len(positions) == 0:
+        return []
+    xs, ys = _cells(positions)
+    pad: int = int(np.ceil(radius))
+    x_min: int = max(int(xs.min()) - pad, 0)
+    y_min: int = max(int(ys.min()) - pad, 0)
+    x_max: int = min(int(xs.max()) + pad + 1, grid.shape[0])
+    y_max: int = min(int(ys.max()) + pad + 1, grid.shape[1])
+
+    safe: np.ndarray = grid[x_min:x_max, y_min:y_max] <= weight_safety_limit
+    if not safe.any():
+        return [None] * len(xs)
+
+    distances, (near_x, near_y) = distance_transform_edt(~safe, return_indices=True)
+    local_x: np.ndarray = xs - x_min
+    local_y: np.ndarray = ys - y_min
+    found: np.ndarray = distances[local_x, local_y] <= radius
+    spot_x: np.ndarray = near_x[local_x, local_y] + x_min
+    spot_y: np.ndarray = near_y[local_x, local_y] + y_min
+    return [
+        Point2((int(x), int(y))) if ok else None
+        for x, y, ok in zip(spot_x, spot_y, found)
+    ]
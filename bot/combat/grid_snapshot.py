@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+from enum import Enum, auto
+
+import numpy as np
+from ares.managers.manager_mediator import ManagerMediator
+from sc2.position import Point2
+
+
+class GridKind(Enum):
+    AIR = auto()
+    AIR_AVOIDANCE = auto()
+    GROUND = auto()
+    GROUND_AVOIDANCE = auto()
+
+
+GRID_GETTERS: dict[GridKind, str] = {
+    GridKind.AIR: "get_air_grid",
+    GridKind.AIR_AVOIDANCE: "get_air_avoidance_grid",
+    GridKind.GROUND: "get_ground_grid",
+    GridKind.GROUND_AVOIDANCE: "get_ground_avoidance_grid",
+}
+
+
+@dataclass
+class GridSnapshot:
+    """Pathing grids and safe spot lookups for a single game loop.
+
+    Grids are fetched from the mediator at most once per loop, and
+    "closest safe spot" results are memoized by grid kind and rounded
+    position so clumped units share one search.
+
+    Parameters
+    ----------
+    game_loop : int
+        The game loop this snapshot was built on.
+    mediator : ManagerMediator
+        Used for getting information from managers in Ares.
+    """
+
+    game_loop: int
+    mediator: ManagerMediator
+    safe_spot_hits: int = 0
+    safe_spot_misses: int = 0
+    _grids: dict[GridKind, np.ndarray] = field(default_factory=dict)
+    _safe_spots: dict[tuple[GridKind, Point2], Point2] = field(default_factory=dict)
+
+    def grid(self, kind: GridKind) -> np.ndarray:
+        if kind not in self._grids:
+            self._grids[kind] = getattr(self.mediator, GRID_GETTERS[kind])
+        return self._grids[kind]
+
+    def is_safe(self, kind: GridKind, position: Point2) -> bool:
+        return self.mediator.is_position_safe(grid=self.grid(kind), position=position)
+
+    def closest_safe_spot(self, kind: GridKind, position: Point2) -> Point2:
+        """Closest safe spot to `position`, shared by units on the same cell.
+
+        Parameters
+        ----------
+        kind : GridKind
+            Which grid to search.
+        position : Point2
+            Where to search from.
+
+        Returns
+        -------
+        Point2
+        """
+        key: tuple[GridKind, Point2] = (kind, position.rounded)
+        if spot := self._safe_spots.get(key):
+            self.safe_spot_hits += 1
+            return spot
+        self.safe_spot_misses += 1
+        spot = self.mediator.find_closest_safe_spot(
+            from_pos=position, grid=self.grid(kind)
+        )
+        self._safe_spots[key] = spot
+        return spot
@@ -4,21 +4,33 @@ from typing import TYPE_CHECKING, Union
 import numpy as np
 from ares.behaviors.combat import CombatManeuver
 from ares.behaviors.combat.individual import (
-    KeepUnitSafe,
-    PathUnitToTarget,
     ShootTargetInRange,
     StutterUnitBack,
 )
-from ares.consts import ALL_STRUCTURES, UnitTreeQueryType
+from ares.consts import UnitTreeQueryType
 from ares.managers.manager_mediator import ManagerMediator
-from cython_extensions import cy_closest_to
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.combat.base_combat import BaseCombat
-from bot.consts import COMMON_UNIT_IGNORE_TYPES
+from bot.combat.enemy_snapshot import (
+    FLYING,
+    IGNORED_TYPE,
+    STRUCTURE,
+    TARGETABLE,
+    EnemySnapshot,
+)
+from bot.combat.grid_snapshot import GridKind, GridSnapshot
+from bot.combat.keep_unit_safe_shared import KeepUnitSafeShared
+from bot.combat.path_unit_to_target_shared import PathUnitToTargetShared
+from bot.combat.range_matrix import (
+    distance_matrix,
+    in_weapon_range_matrix,
+    unit_weapon_arrays,
+)
+from bot.combat.target_assignment import assign_targets
 
 if TYPE_CHECKING:
     from ares import AresBot
@@ -30,6 +42,7 @@ DANGER_TO_AIR: set[UnitID] = {
     UnitID.SPORECRAWLER,
     UnitID.BUNKER,
 }
+QUERY_DISTANCE: float = 13.0
 
 
 @dataclass
@@ -54,46 +67,53 @@ class GroundRangeCombat(BaseCombat):
         target: Point2 = (
             kwargs["target"] if "target" in kwargs else self.ai.enemy_start_locations[0]
         )
-        near_enemy: dict[int, Units] = self.mediator.get_units_in_range(
-            start_points=units,
-            distances=13,
-            query_tree=UnitTreeQueryType.AllEnemy,
-            return_as_dict=True,
+        if not units:
+            return
+
+        units = list(units)
+        grids: GridSnapshot = self.ai.grid_snapshot
+        grid: np.ndarray = grids.grid(GridKind.GROUND)
+
+        snapshot: EnemySnapshot = self.ai.enemy_snapshot
+        close_idx, distances, in_weapon_range = self._squad_neighbours(units, snapshot)
+        is_unit: np.ndarray = (snapshot.flags[close_idx] & STRUCTURE) == 0
+        # a unit's own neighbours are the targets within QUERY_DISTANCE of it
+        max_distance: float = QUERY_DISTANCE + 1e-3
+        unit_targets: list[Unit | None] = assign_targets(
+            units, snapshot.units_at(close_idx[is_unit]), max_distance=max_distance
+        )
+        any_targets: list[Unit | None] = assign_targets(
+            units, snapshot.units_at(close_idx), max_distance=max_distance
         )
-        avoid_grid: np.ndarray = self.mediator.get_air_avoidance_grid
-        grid: np.ndarray = self.mediator.get_ground_grid
-
-        for unit in units:
-            close_enemy: list[Unit] = [
-                u
-                for u in near_enemy[unit.tag]
-                if (not u.is_cloaked or u.is_cloaked and u.is_revealed)
-                and (not u.is_burrowed or u.is_burrowed and u.is_visible)
-                and not u.is_memory
-                and not u.is_snapshot
-                and u.type_id not in COMMON_UNIT_IGNORE_TYPES
-            ]
-
-            only_enemy_units: list[Unit] = [
-                u for u in close_enemy if u.type_id not in ALL_STRUCTURES
-            ]
 
+        # per unit only boolean rows, units are only looked up for the
+        # few enemies already in weapon range
+        near: np.ndarray = distances <= QUERY_DISTANCE
+        near_units: np.ndarray = near & is_unit
+        any_near: np.ndarray = near.any(axis=1)
+        any_near_units: np.ndarray = near_units.any(axis=1)
+        for i, unit in enumerate(units):
             attacking_maneuver: CombatManeuver = CombatManeuver()
-            attacking_maneuver.add(KeepUnitSafe(unit=unit, grid=avoid_grid))
-
-            attacking_maneuver.add(ShootTargetInRange(unit, only_enemy_units))
-            if not only_enemy_units:
-                attacking_maneuver.add(ShootTargetInRange(unit, close_enemy))
+            attacking_maneuver.add(
+                KeepUnitSafeShared(unit, grids, GridKind.AIR_AVOIDANCE)
+            )
+
+            # `ShootTargetInRange` only shoots at enemies in weapon range
+            shoot_mask: np.ndarray = in_weapon_range[i] & (
+                near_units[i] if any_near_units[i] else near[i]
+            )
+            if shoot_mask.any():
+                attacking_maneuver.add(
+                    ShootTargetInRange(unit, snapshot.units_at(close_idx[shoot_mask]))
+                )
 
             if unit.shield_percentage < 0.3:
-                attacking_maneuver.add(KeepUnitSafe(unit=unit, grid=grid))
+                attacking_maneuver.add(KeepUnitSafeShared(unit, grids, GridKind.GROUND))
 
-            elif close_enemy:
-                target_unit: Unit | None
-                if only_enemy_units:
-                    target_unit = cy_closest_to(unit.position, only_enemy_units)
-                else:
-                    target_unit = cy_closest_to(unit.position, close_enemy)
+            elif any_near[i]:
+                target_unit: Unit = (
+                    unit_targets[i] if any_near_units[i] else any_targets[i]
+                )
 
                 attacking_maneuver.add(
                     StutterUnitBack(unit=unit, target=target_unit, grid=grid)
@@ -101,6 +121,53 @@ class GroundRangeCombat(BaseCombat):
 
             else:
                 attacking_maneuver.add(
-                    PathUnitToTarget(unit=unit, target=target, grid=grid)
+                    PathUnitToTargetShared(unit, grids, GridKind.GROUND, target)
                 )
             self.ai.register_behavior(attacking_maneuver)
+
+    def _squad_neighbours(
+        self, units: list[Unit], snapshot: EnemySnapshot
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find enemies near the squad with one query and one distance matrix.
+
+        Parameters
+        ----------
+        units : list[Unit]
+            Squad units.
+        snapshot : EnemySnapshot
+            Enemy snapshot for this game loop.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            Snapshot indices of targetable enemies near the squad, the
+            (num units, num enemies) distance matrix to them, and the
+            matching matrix of which are in weapon range.
+        """
+        positions, radii, ground_ranges, air_ranges = unit_weapon_arrays(units)
+        centre: np.ndarray = positions.mean(axis=0)
+        squad_radius: float = float(
+            np.sqrt(np.max(np.sum((positions - centre) ** 2, axis=1)))
+        )
+        near_squad: Units = self.mediator.get_units_in_range(
+            start_points=[Point2(centre)],
+            distances=QUERY_DISTANCE + squad_radius,
+            query_tree=UnitTreeQueryType.AllEnemy,
+        )[0]
+        close_idx: np.ndarray = snapshot.select(
+            snapshot.indices_of(near_squad),
+            require=TARGETABLE,
+            exclude=IGNORED_TYPE,
+        )
+        distances: np.ndarray = distance_matrix(
+            positions, snapshot.positions[close_idx]
+        )
+        in_weapon_range: np.ndarray = in_weapon_range_matrix(
+            distances,
+            radii,
+            ground_ranges,
+            air_ranges,
+            snapshot.radii[close_idx],
+            (snapshot.flags[close_idx] & FLYING) != 0,
+        )
+        return close_idx, distances, in_weapon_range
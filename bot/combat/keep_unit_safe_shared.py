@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ares.behaviors.combat.individual.combat_individual_behavior import (
+    CombatIndividualBehavior,
+)
+from ares.managers.manager_mediator import ManagerMediator
+from sc2.position import Point2
+from sc2.unit import Unit
+
+from bot.combat.grid_snapshot import GridKind, GridSnapshot
+from bot.combat.path_unit_to_target_shared import PathUnitToTargetShared
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class KeepUnitSafeShared(CombatIndividualBehavior):
+    """Same as Ares `KeepUnitSafe`, but safe spots come from the shared
+    per-frame `GridSnapshot` cache.
+
+    Attributes
+    ----------
+    unit : Unit
+        The unit to keep safe.
+    grids : GridSnapshot
+        Grid snapshot for this game loop.
+    kind : GridKind
+        Which grid to check safety on.
+    """
+
+    unit: Unit
+    grids: GridSnapshot
+    kind: GridKind
+
+    def execute(
+        self, ai: "AresBot", config: dict, mediator: ManagerMediator, **kwargs
+    ) -> bool:
+        position: Point2 = self.unit.position
+        if self.grids.is_safe(self.kind, position):
+            return False
+
+        safe_spot: Point2 = self.grids.closest_safe_spot(self.kind, position)
+        return PathUnitToTargetShared(
+            self.unit, self.grids, self.kind, safe_spot
+        ).execute(ai, config, mediator)
@@ -0,0 +1,260 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+from sc2.position import Point2
+
+from bot.combat.grid_snapshot import GridKind, GridSnapshot
+
+# how far along the path the next move command goes, as Ares' default
+NEXT_POINT_OFFSET: int = 5
+# units this close to a cached path join it instead of searching
+SHARE_DISTANCE: float = 2.0
+# fresh path searches allowed per game loop, repairs included
+MAX_SEARCHES_PER_FRAME: int = 8
+# when a path gets more dangerous, re-path from this many points earlier
+REPAIR_BACKOFF: int = 6
+# cached paths not used for this long are dropped
+EXPIRE_AFTER_LOOPS: int = 112
+# no pathing at all without danger this close, as Ares' `sense_danger`
+DANGER_DISTANCE: float = 20.0
+DANGER_THRESHOLD: float = 5.0
+
+
+@dataclass
+class CachedPath:
+    """A path and the grid weights it was found on.
+
+    Attributes
+    ----------
+    points : np.ndarray
+        (n, 2) path points, start to target.
+    weights : np.ndarray
+        Grid weight under each point when last checked.
+    checked_game_loop : int
+        Last game loop the weights were compared against the grid.
+    used_game_loop : int
+        Last game loop a unit followed this path.
+    """
+
+    points: np.ndarray
+    weights: np.ndarray
+    checked_game_loop: int
+    used_game_loop: int
+
+
+@dataclass
+class PathCache:
+    """Paths shared by every unit heading for the same target on the same
+    grid.
+
+    A unit within `SHARE_DISTANCE` of a cached path follows it from the
+    closest point on. Once per game loop each path in use is compared
+    against the current grid; if it only got safer it is kept, if it got
+    more dangerous the rest of it is searched again from just before the
+    first worse cell. Searches are capped per game loop. Under the cap
+    a unit with no path to share is pathed on its own with Ares'
+    `find_path_next_point`, which counts against the same cap. Over it
+    units keep following stale paths, or go to the last point they were
+    given, or straight to the target.
+
+    Attributes
+    ----------
+    game_loop : int
+        Game loop the per-frame search budget belongs to.
+    searches : int
+        Path searches done this game loop, fallbacks included.
+    hits : int
+        Total lookups answered from a cached path.
+    repairs : int
+        Total partial re-searches.
+    misses : int
+        Total full searches.
+    fallbacks : int
+        Total lookups pathed per unit by Ares.
+    over_budget : int
+        Total lookups answered without any search, over the budget.
+    """
+
+    game_loop: int = -1
+    searches: int = 0
+    hits: int = 0
+    repairs: int = 0
+    misses: int = 0
+    fallbacks: int = 0
+    over_budget: int = 0
+    _paths: dict[tuple[GridKind, Point2], list[CachedPath]] = field(
+        default_factory=dict
+    )
+    # unit tag -> (last point given, game loop it was given on)
+    _last_points: dict[int, tuple[Point2, int]] = field(default_factory=dict)
+
+    def next_point(
+        self,
+        grids: GridSnapshot,
+        kind: GridKind,
+        start: Point2,
+        target: Point2,
+        tag: int = 0,
+    ) -> Point2:
+        """Where a unit at `start` should move to on its way to `target`.
+
+        Parameters
+        ----------
+        grids : GridSnapshot
+            Grid snapshot for this game loop.
+        kind : GridKind
+            Which grid to path on.
+        start : Point2
+            The unit's position.
+        target : Point2
+            Where the unit is going.
+        tag : int
+            The unit's tag, used to keep it moving once over the budget.
+
+        Returns
+        -------
+        Point2
+        """
+        self._begin_frame(grids.game_loop)
+        grid: np.ndarray = grids.grid(kind)
+        if not _danger_near(grid, start):
+            return target
+
+        entries: list[CachedPath] = self._paths.setdefault((kind, target.rounded), [])
+        stale: tuple[CachedPath, int] | None = None
+        for entry in entries:
+            d_sq: np.ndarray = np.sum((entry.points - start) ** 2, axis=1)
+            index: int = int(np.argmin(d_sq))
+            if d_sq[index] > SHARE_DISTANCE**2:
+                continue
+            if self._still_valid(entry, index, grids, grid, target):
+                self.hits += 1
+                return self._remember(tag, self._follow(entry, index))
+            stale = (entry, index)
+
+        if self.searches < MAX_SEARCHES_PER_FRAME:
+            if entry := self._search(grids, grid, start, target):
+                entries.append(entry)
+                self.misses += 1
+                return self._remember(tag, self._follow(entry, 0))
+        if stale:
+            return self._remember(tag, self._follow(*stale))
+        if self.searches < MAX_SEARCHES_PER_FRAME:
+            # nothing to share, path this unit on its own
+            self.searches += 1
+            self.fallbacks += 1
+            return self._remember(
+                tag,
+                grids.mediator.find_path_next_point(
+                    start=start,
+                    target=target,
+                    grid=grid,
+                    sensitivity=NEXT_POINT_OFFSET,
+                    danger_distance=DANGER_DISTANCE,
+                    danger_threshold=DANGER_THRESHOLD,
+                ),
+            )
+        # over budget, keep going until there is budget to path again
+        self.over_budget += 1
+        if last := self._last_points.get(tag):
+            point: Point2 = last[0]
+            if (point.x - start.x) ** 2 + (point.y - start.y) ** 2 > 1.0:
+                return point
+        return target
+
+    def _begin_frame(self, game_loop: int) -> None:
+        if game_loop == self.game_loop:
+            return
+        self.game_loop = game_loop
+        self.searches = 0
+        for key in list(self._paths):
+            self._paths[key] = [
+                p
+                for p in self._paths[key]
+                if game_loop - p.used_game_loop < EXPIRE_AFTER_LOOPS
+            ]
+            if not self._paths[key]:
+                del self._paths[key]
+        for tag in [
+            tag
+            for tag, (_, given_on) in self._last_points.items()
+            if game_loop - given_on >= EXPIRE_AFTER_LOOPS
+        ]:
+            del self._last_points[tag]
+
+    def _remember(self, tag: int, point: Point2) -> Point2:
+        if tag:
+            self._last_points[tag] = (point, self.game_loop)
+        return point
+
+    def _follow(self, entry: CachedPath, index: int) -> Point2:
+        entry.used_game_loop = self.game_loop
+        next_index: int = min(index + NEXT_POINT_OFFSET, len(entry.points) - 1)
+        x, y = entry.points[next_index]
+        return Point2((float(x), float(y)))
+
+    def _search(
+        self, grids: GridSnapshot, grid: np.ndarray, start: Point2, target: Point2
+    ) -> CachedPath | None:
+        self.searches += 1
+        path: list[Point2] | None = grids.mediator.find_raw_path(
+            start=start, target=target, grid=grid, sensitivity=1
+        )
+        if not path:
+            return None
+        points: np.ndarray = np.array(path, dtype=np.float64)
+        return CachedPath(
+            points=points,
+            weights=_weights(grid, points),
+            checked_game_loop=self.game_loop,
+            used_game_loop=self.game_loop,
+        )
+
+    def _still_valid(
+        self,
+        entry: CachedPath,
+        index: int,
+        grids: GridSnapshot,
+        grid: np.ndarray,
+        target: Point2,
+    ) -> bool:
+        """Check `entry` against this loop's grid, repairing it if possible."""
+        if entry.checked_game_loop == self.game_loop:
+            return True
+        weights: np.ndarray = _weights(grid, entry.points)
+        worse: np.ndarray = np.flatnonzero(weights[index:] > entry.weights[index:])
+        if len(worse) == 0:
+            entry.weights = weights
+            entry.checked_game_loop = self.game_loop
+            return True
+        if self.searches >= MAX_SEARCHES_PER_FRAME:
+            return False
+
+        # keep the path up to just before the first worse cell
+        keep: int = max(index, index + int(worse[0]) - REPAIR_BACKOFF)
+        repaired: CachedPath | None = self._search(
+            grids, grid, Point2(entry.points[keep]), target
+        )
+        if repaired is None:
+            return False
+        self.repairs += 1
+        entry.points = np.concatenate((entry.points[:keep], repaired.points))
+        entry.weights = np.concatenate((weights[:keep], repaired.weights))
+        entry.checked_game_loop = self.game_loop
+        return True
+
+
+def _weights(grid: np.ndarray, points: np.ndarray) -> np.ndarray:
+    cells: np.ndarray = points.astype(np.intp)
+    return grid[cells[:, 0], cells[:, 1]]
+
+
+def _danger_near(grid: np.ndarray, position: Point2) -> bool:
+    x, y = int(position.x), int(position.y)
+    d: int = int(DANGER_DISTANCE)
+    window: np.ndarray = grid[
+        max(x - d, 0) : x + d + 1,
+        max(y - d, 0) : y + d + 1,
+    ]
+    finite: np.ndarray = window[np.isfinite(window)]
+    return bool(finite.size) and finite.max() > DANGER_THRESHOLD
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ares.behaviors.combat.individual.combat_individual_behavior import (
+    CombatIndividualBehavior,
+)
+from ares.managers.manager_mediator import ManagerMediator
+from cython_extensions.geometry import cy_distance_to
+from sc2.position import Point2
+from sc2.unit import Unit
+
+from bot.combat.grid_snapshot import GridKind, GridSnapshot
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class PathUnitToTargetShared(CombatIndividualBehavior):
+    """Same as Ares `PathUnitToTarget`, but the path comes from the shared
+    `PathCache` so units heading to the same target share one search.
+
+    Attributes
+    ----------
+    unit : Unit
+        The unit to path.
+    grids : GridSnapshot
+        Grid snapshot for this game loop.
+    kind : GridKind
+        Which grid to path on.
+    target : Point2
+        Where the unit is going.
+    success_at_distance : float
+        Do nothing once this close to `target`.
+    """
+
+    unit: Unit
+    grids: GridSnapshot
+    kind: GridKind
+    target: Point2
+    success_at_distance: float = 0.0
+
+    def execute(
+        self, ai: "AresBot", config: dict, mediator: ManagerMediator, **kwargs
+    ) -> bool:
+        if cy_distance_to(self.unit.position, self.target) < self.success_at_distance:
+            return False
+
+        self.unit.move(
+            ai.path_cache.next_point(
+                self.grids, self.kind, self.unit.position, self.target, self.unit.tag
+            )
+        )
+        return True
@@ -1,9 +1,8 @@
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Union
 
-import numpy as np
 from ares.behaviors.combat import CombatManeuver
-from ares.behaviors.combat.individual import KeepUnitSafe, PathUnitToTarget, UseAbility
+from ares.behaviors.combat.individual import UseAbility
 from ares.managers.manager_mediator import ManagerMediator
 from cython_extensions.geometry import cy_distance_to_squared
 from sc2.ids.ability_id import AbilityId
@@ -14,6 +13,9 @@ from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.combat.base_combat import BaseCombat
+from bot.combat.grid_snapshot import GridKind, GridSnapshot
+from bot.combat.keep_unit_safe_shared import KeepUnitSafeShared
+from bot.combat.path_unit_to_target_shared import PathUnitToTargetShared
 
 if TYPE_CHECKING:
     from ares import AresBot
@@ -50,8 +52,7 @@ class ProbeProxyBuilder(BaseCombat):
         primary_builder_tag: int = kwargs["primary_builder_tag"]
         next_item_to_build: UnitTypeId | None = kwargs["next_item_to_build"]
         build_location: Point2 | None = kwargs["build_location"]
-        avoid_grid: np.ndarray = self.mediator.get_ground_avoidance_grid
-        grid: np.ndarray = self.mediator.get_ground_grid
+        grids: GridSnapshot = self.ai.grid_snapshot
         ability_id: AbilityId | None = None
         if next_item_to_build:
             ability_id = self.ai.game_data.units[
@@ -63,7 +64,9 @@ class ProbeProxyBuilder(BaseCombat):
                 continue
 
             proxy_maneuver: CombatManeuver = CombatManeuver()
-            proxy_maneuver.add(KeepUnitSafe(unit=unit, grid=avoid_grid))
+            proxy_maneuver.add(
+                KeepUnitSafeShared(unit, grids, GridKind.GROUND_AVOIDANCE)
+            )
             # attacking_maneuver.add(ShootTargetInRange(unit, close_enemy))
 
             if (
@@ -80,19 +83,21 @@ class ProbeProxyBuilder(BaseCombat):
                     )
                 else:
                     proxy_maneuver.add(
-                        PathUnitToTarget(unit=unit, target=build_location, grid=grid)
+                        PathUnitToTargetShared(
+                            unit, grids, GridKind.GROUND, build_location
+                        )
                     )
             else:
                 if unit.tag != primary_builder_tag or (
                     not build_location
                     and cy_distance_to_squared(unit.position, target) < 100.0
                 ):
-                    proxy_maneuver.add(KeepUnitSafe(unit=unit, grid=grid))
+                    proxy_maneuver.add(KeepUnitSafeShared(unit, grids, GridKind.GROUND))
                 proxy_maneuver.add(
-                    PathUnitToTarget(
-                        unit=unit, target=target, grid=grid, success_at_distance=4.0
+                    PathUnitToTargetShared(
+                        unit, grids, GridKind.GROUND, target, success_at_distance=4.0
                     )
                 )
                 if unit.tag == primary_builder_tag:
-                    proxy_maneuver.add(KeepUnitSafe(unit=unit, grid=grid))
+                    proxy_maneuver.add(KeepUnitSafeShared(unit, grids, GridKind.GROUND))
             self.ai.register_behavior(proxy_maneuver)
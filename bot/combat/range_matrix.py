@@ -0,0 +1,66 @@
+import numpy as np
+from sc2.unit import Unit
+
+# added to non flying distances so flying threats are always preferred
+_GROUND_PENALTY: float = 1.0e6
+
+
+def distance_matrix(
+    unit_positions: np.ndarray, enemy_positions: np.ndarray
+) -> np.ndarray:
+    """Pairwise distances, shape (num units, num enemies)."""
+    deltas: np.ndarray = unit_positions[:, None, :] - enemy_positions[None, :, :]
+    return np.sqrt(np.einsum("ijk,ijk->ij", deltas, deltas))
+
+
+def unit_weapon_arrays(
+    units: list[Unit],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Positions, radii, ground ranges and air ranges of own units."""
+    num_units: int = len(units)
+    positions: np.ndarray = np.empty((num_units, 2), dtype=np.float64)
+    radii: np.ndarray = np.empty(num_units, dtype=np.float64)
+    ground_ranges: np.ndarray = np.empty(num_units, dtype=np.float64)
+    air_ranges: np.ndarray = np.empty(num_units, dtype=np.float64)
+    for i, unit in enumerate(units):
+        positions[i] = unit.position
+        radii[i] = unit.radius
+        ground_ranges[i] = unit.ground_range
+        air_ranges[i] = unit.air_range
+    return positions, radii, ground_ranges, air_ranges
+
+
+def in_weapon_range_matrix(
+    distances: np.ndarray,
+    unit_radii: np.ndarray,
+    ground_ranges: np.ndarray,
+    air_ranges: np.ndarray,
+    enemy_radii: np.ndarray,
+    enemy_flying: np.ndarray,
+) -> np.ndarray:
+    """Boolean (num units, num enemies) matrix of enemies in weapon range.
+
+    Uses air range vs flying enemies and ground range otherwise, plus
+    both radii, matching `unit.target_in_range`.
+    """
+    weapon_range: np.ndarray = np.where(
+        enemy_flying[None, :], air_ranges[:, None], ground_ranges[:, None]
+    )
+    return distances <= weapon_range + unit_radii[:, None] + enemy_radii[None, :]
+
+
+def pick_threat_targets(
+    distances: np.ndarray, in_range: np.ndarray, enemy_flying: np.ndarray
+) -> np.ndarray:
+    """Column index of the target for each unit, or -1 if nothing is in range.
+
+    Flying enemies in range are picked first, then the closest enemy.
+    """
+    if distances.shape[1] == 0:
+        return np.full(distances.shape[0], -1, dtype=np.intp)
+    scores: np.ndarray = np.where(
+        in_range, distances + np.where(enemy_flying, 0.0, _GROUND_PENALTY), np.inf
+    )
+    targets: np.ndarray = np.argmin(scores, axis=1)
+    targets[~in_range.any(axis=1)] = -1
+    return targets
@@ -0,0 +1,76 @@
+import numpy as np
+from sc2.unit import Unit
+from scipy.spatial import KDTree
+
+NUM_CANDIDATES: int = 8
+
+
+def assign_targets(
+    units: list[Unit],
+    targets: list[Unit],
+    max_distance: float = np.inf,
+    overkill: float = 1.25,
+    num_candidates: int = NUM_CANDIDATES,
+) -> list[Unit | None]:
+    """Assign a target to every unit in a squad in one pass.
+
+    A KD-tree over `targets` gives each unit its closest candidates. Units
+    closest to the enemy pick first and take their nearest candidate that
+    still has damage capacity left, where capacity is the target's health
+    plus shield times `overkill`. If every candidate is saturated the unit
+    falls back to its nearest candidate.
+
+    Parameters
+    ----------
+    units : list[Unit]
+        Own units to assign targets to.
+    targets : list[Unit]
+        Possible targets.
+    max_distance : float
+        Targets further than this from a unit are not considered for it.
+    overkill : float
+        Multiplier on target health + shield before it counts as saturated.
+    num_candidates : int
+        How many nearby targets each unit considers.
+
+    Returns
+    -------
+    list[Unit | None]
+        Target per unit, in the same order as `units`. None if there was no
+        target within `max_distance`.
+    """
+    num_units: int = len(units)
+    num_targets: int = len(targets)
+    assigned: list[Unit | None] = [None] * num_units
+    if num_units == 0 or num_targets == 0:
+        return assigned
+
+    k: int = min(num_candidates, num_targets)
+    tree: KDTree = KDTree(np.array([t.position for t in targets], dtype=np.float64))
+    distances, indices = tree.query(
+        np.array([u.position for u in units], dtype=np.float64),
+        k=k,
+        distance_upper_bound=max_distance,
+    )
+    distances = distances.reshape(num_units, k)
+    indices = indices.reshape(num_units, k)
+
+    capacity: np.ndarray = (
+        np.array([t.health + t.shield for t in targets], dtype=np.float64) * overkill
+    )
+    # closest units commit first, they will be shooting soonest
+    for i in np.argsort(distances[:, 0], kind="stable"):
+        if not np.isfinite(distances[i, 0]):
+            continue
+        unit: Unit = units[i]
+        choice: int = indices[i, 0]
+        for j in indices[i]:
+            if j == num_targets:
+                break
+            if capacity[j] > 0.0:
+                choice = j
+                break
+        target: Unit = targets[choice]
+        capacity[choice] -= unit.air_dps if target.is_flying else unit.ground_dps
+        assigned[i] = target
+    return assigned
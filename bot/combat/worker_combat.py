@@ -5,19 +5,21 @@ import numpy as np
 from ares.behaviors.combat import CombatManeuver
 from ares.behaviors.combat.individual import (
     AttackTarget,
-    KeepUnitSafe,
-    PathUnitToTarget,
     ShootTargetInRange,
     WorkerKiteBack,
 )
-from ares.consts import ALL_STRUCTURES
 from ares.managers.manager_mediator import ManagerMediator
-from cython_extensions import cy_closest_to
 from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.combat.base_combat import BaseCombat
+from bot.combat.enemy_snapshot import STRUCTURE, TARGETABLE, EnemySnapshot
+from bot.combat.grid_queries import positions_safe
+from bot.combat.grid_snapshot import GridKind, GridSnapshot
+from bot.combat.keep_unit_safe_shared import KeepUnitSafeShared
+from bot.combat.path_unit_to_target_shared import PathUnitToTargetShared
+from bot.combat.target_assignment import assign_targets
 from bot.consts import SUPPLY_TYPES
 
 if TYPE_CHECKING:
@@ -50,47 +52,50 @@ class WorkerCombat(BaseCombat):
         ramp_walled_off = (
             kwargs["ramp_walled_off"] if "ramp_walled_off" in kwargs else False
         )
-        avoid_grid: np.ndarray = self.mediator.get_air_avoidance_grid
-        grid: np.ndarray = self.mediator.get_ground_grid
+        grids: GridSnapshot = self.ai.grid_snapshot
+        grid: np.ndarray = grids.grid(GridKind.GROUND)
         can_attack_structures: bool = self.ai.time > 90.0 or ramp_walled_off
-        close_enemy: list[Unit] = [
-            u
-            for u in close_enemy
-            if (not u.is_cloaked or u.is_cloaked and u.is_revealed)
-            and (not u.is_burrowed or u.is_burrowed and u.is_visible)
-            and not u.is_memory
-            and not u.is_snapshot
-        ]
-
-        only_enemy_units: list[Unit] = [
-            u for u in close_enemy if u.type_id not in ALL_STRUCTURES
-        ]
-        enemy_structures = [u for u in close_enemy if u.type_id in ALL_STRUCTURES]
+        snapshot: EnemySnapshot = self.ai.enemy_snapshot
+        close_idx: np.ndarray = snapshot.select(
+            snapshot.indices_of(close_enemy), require=TARGETABLE
+        )
+        close_enemy: list[Unit] = snapshot.units_at(close_idx)
+        only_enemy_units: list[Unit] = snapshot.units_at(
+            snapshot.select(close_idx, exclude=STRUCTURE)
+        )
+        enemy_structures: list[Unit] = snapshot.units_at(
+            snapshot.select(close_idx, require=STRUCTURE)
+        )
         close_supply = [u for u in enemy_structures if u.type_id in SUPPLY_TYPES]
 
-        for unit in units:
+        target_candidates: list[Unit] = []
+        if only_enemy_units and len(only_enemy_units) >= 3:
+            target_candidates = only_enemy_units
+        elif close_supply:
+            target_candidates = close_supply
+        elif can_attack_structures and enemy_structures:
+            target_candidates = enemy_structures
+        units = list(units)
+        assigned_targets: list[Unit | None] = assign_targets(units, target_candidates)
+        safe: np.ndarray = positions_safe(grid, [u.position for u in units])
+
+        for i, unit in enumerate(units):
             if unit.is_carrying_minerals:
                 unit.return_resource()
                 continue
 
             attacking_maneuver: CombatManeuver = CombatManeuver()
-            attacking_maneuver.add(KeepUnitSafe(unit=unit, grid=avoid_grid))
+            attacking_maneuver.add(
+                KeepUnitSafeShared(unit, grids, GridKind.AIR_AVOIDANCE)
+            )
             attacking_maneuver.add(ShootTargetInRange(unit, only_enemy_units))
             attacking_maneuver.add(ShootTargetInRange(unit, close_supply))
             if (not only_enemy_units and can_attack_structures) or ramp_walled_off:
                 attacking_maneuver.add(ShootTargetInRange(unit, close_enemy))
             if close_enemy:
-                target_unit: Unit | None = None
-                if only_enemy_units and len(only_enemy_units) >= 3:
-                    target_unit = cy_closest_to(unit.position, only_enemy_units)
-                elif close_supply:
-                    target_unit = cy_closest_to(unit.position, close_supply)
-                elif can_attack_structures and enemy_structures:
-                    target_unit = cy_closest_to(unit.position, enemy_structures)
+                target_unit: Unit | None = assigned_targets[i]
 
-                if target_unit and not self.mediator.is_position_safe(
-                    grid=grid, position=unit.position
-                ):
+                if target_unit and not safe[i]:
                     attacking_maneuver.add(
                         WorkerKiteBack(unit=unit, target=target_unit)
                     )
@@ -98,6 +103,6 @@ class WorkerCombat(BaseCombat):
                     attacking_maneuver.add(AttackTarget(unit=unit, target=target_unit))
 
             attacking_maneuver.add(
-                PathUnitToTarget(unit=unit, target=target, grid=grid)
+                PathUnitToTargetShared(unit, grids, GridKind.GROUND, target)
             )
             self.ai.register_behavior(attacking_maneuver)
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from sc2.ids.ability_id import AbilityId
+from sc2.position import Point2
+from sc2.unit import Unit, UnitOrder
+from sc2.unit_command import UnitCommand
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+# the only commands behaviors re-issue every step, anything else (train,
+# research, stop, hold...) is sent even if it repeats the current order
+FILTERED_ABILITIES: set[AbilityId] = {
+    AbilityId.ATTACK,
+    AbilityId.ATTACK_ATTACK,
+    AbilityId.HARVEST_GATHER,
+    AbilityId.HARVEST_GATHER_DRONE,
+    AbilityId.HARVEST_GATHER_MULE,
+    AbilityId.HARVEST_GATHER_PROBE,
+    AbilityId.HARVEST_GATHER_SCV,
+    AbilityId.HARVEST_RETURN,
+    AbilityId.HARVEST_RETURN_DRONE,
+    AbilityId.HARVEST_RETURN_MULE,
+    AbilityId.HARVEST_RETURN_PROBE,
+    AbilityId.HARVEST_RETURN_SCV,
+    AbilityId.MOVE,
+    AbilityId.MOVE_MOVE,
+}
+
+
+@dataclass
+class CommandFilter:
+    """Drop move, attack, gather and return commands that repeat the order
+    a unit is already executing.
+
+    Behaviors re-issue the same move / attack every step, this runs after
+    the opening has registered everything for the frame and strips those
+    out of `ai.actions` before they are sent to the client.
+
+    Parameters
+    ----------
+    position_tolerance : float
+        Point targets closer than this to the current order target are
+        treated as the same target.
+    """
+
+    position_tolerance: float = 1.0
+    dropped_this_frame: int = 0
+    sent_this_frame: int = 0
+    total_dropped: int = 0
+    total_sent: int = 0
+
+    def apply(self, ai: "AresBot") -> None:
+        """Filter `ai.actions` in place and update the counters.
+
+        Parameters
+        ----------
+        ai : AresBot
+            Bot object that will be running the game
+        """
+        actions: list[UnitCommand] = ai.actions
+        kept: list[UnitCommand] = [a for a in actions if not self._is_duplicate(a)]
+        self.dropped_this_frame = len(actions) - len(kept)
+        self.sent_this_frame = len(kept)
+        self.total_dropped += self.dropped_this_frame
+        self.total_sent += self.sent_this_frame
+        actions[:] = kept
+
+    def _is_duplicate(self, action: UnitCommand) -> bool:
+        if action.queue or action.ability not in FILTERED_ABILITIES:
+            return False
+        orders: list[UnitOrder] = action.unit.orders
+        # only compare against a single active order, queued orders
+        # would be wiped by a non-queued command
+        if len(orders) != 1:
+            return False
+        order: UnitOrder = orders[0]
+        if action.ability not in {order.ability.id, order.ability.exact_id}:
+            return False
+
+        target = action.target
+        if target is None:
+            # return cargo
+            return True
+        if isinstance(target, Unit):
+            return order.target == target.tag
+        if isinstance(order.target, Point2):
+            return target.distance_to_point2(order.target) < self.position_tolerance
+        return False
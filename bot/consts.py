@@ -1,3 +1,5 @@
+import platform
+
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
 
@@ -58,3 +60,19 @@ SUPPLY_TYPES: set[UnitID] = {
     UnitID.PYLON,
 }
 
+MAP_FILE_EXT: str = "SC2Map"
+# change if non default setup / linux
+# if having issues with this, modify `map_list` in `run.py` manually
+if platform.system() == "Windows":
+    MAPS_PATH: str = "C:\\Program Files (x86)\\StarCraft II\\Maps"
+elif platform.system() == "Darwin":
+    MAPS_PATH: str = "/Applications/StarCraft II/Maps"
+elif platform.system() == "Linux":
+    # path would look a bit like this on linux after installing
+    # SC2 via lutris
+    MAPS_PATH: str = (
+        "~/<username>/Games/battlenet/drive_c/Program Files (x86)/StarCraft II/Maps"
+    )
+else:
+    # not supported
+    MAPS_PATH: str = ""
@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+
+from sc2.unit import Unit
+
+
+@dataclass
+class DamageTaken:
+    """Own units and structures damaged since the last step.
+
+    Filled from `on_unit_took_damage`, which python-sc2 calls before the
+    step, and cleared by MyBot once its step is done, however it ended.
+    Anything running in `on_step` sees the whole game loop's damage at
+    once.
+
+    Attributes
+    ----------
+    units : dict[int, Unit]
+        Tag -> the damaged unit, as last reported.
+    """
+
+    units: dict[int, Unit] = field(default_factory=dict)
+
+    def record(self, unit: Unit) -> None:
+        self.units[unit.tag] = unit
+
+    def clear(self) -> None:
+        self.units.clear()
@@ -0,0 +1,133 @@
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from sc2.unit import Unit
+
+# Terran structures that keep their tag when they lift off or land
+LIFTABLE_TYPES: set[UnitTypeId] = {
+    UnitTypeId.BARRACKS,
+    UnitTypeId.BARRACKSFLYING,
+    UnitTypeId.COMMANDCENTER,
+    UnitTypeId.COMMANDCENTERFLYING,
+    UnitTypeId.FACTORY,
+    UnitTypeId.FACTORYFLYING,
+    UnitTypeId.ORBITALCOMMAND,
+    UnitTypeId.ORBITALCOMMANDFLYING,
+    UnitTypeId.STARPORT,
+    UnitTypeId.STARPORTFLYING,
+}
+
+
+@dataclass
+class EnemyStructureTracker:
+    """Known enemy structures, counted by type and flying state.
+
+    Follows `ai.enemy_structures` (snapshots included) through vision and
+    death events rather than scanning it every step. Against Terran,
+    `sync_liftable` catches structures lifting off, landing or flying
+    around in sight, which raise no event.
+
+    Attributes
+    ----------
+    counts : dict[tuple[UnitTypeId, bool], int]
+        (type, is flying) -> number of known structures.
+    flying_count : int
+        Number of known flying structures.
+    """
+
+    counts: dict[tuple[UnitTypeId, bool], int] = field(default_factory=dict)
+    flying_count: int = 0
+    # tag -> (type, is flying)
+    _tags: dict[int, tuple[UnitTypeId, bool]] = field(default_factory=dict)
+    _positions: dict[UnitTypeId, dict[int, Point2]] = field(default_factory=dict)
+    _version: int = 0
+    # (position, types) -> (tracker version, closest position)
+    _closest_cache: dict[
+        tuple[Point2, frozenset[UnitTypeId] | None], tuple[int, Point2 | None]
+    ] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def add(self, structure: Unit) -> None:
+        """Track `structure`, replacing what was known about its tag."""
+        self.remove(structure.tag)
+        key: tuple[UnitTypeId, bool] = (structure.type_id, structure.is_flying)
+        self._tags[structure.tag] = key
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.flying_count += structure.is_flying
+        self._positions.setdefault(structure.type_id, {})[
+            structure.tag
+        ] = structure.position
+        self._version += 1
+
+    def remove(self, tag: int) -> None:
+        """Forget the structure with `tag`, if it was tracked."""
+        key: tuple[UnitTypeId, bool] | None = self._tags.pop(tag, None)
+        if key is None:
+            return
+        type_id, is_flying = key
+        self.counts[key] -= 1
+        self.flying_count -= is_flying
+        del self._positions[type_id][tag]
+        self._version += 1
+
+    def sync_liftable(self, structures: Iterable[Unit]) -> None:
+        """Re-track visible liftable structures that lifted, landed or moved.
+
+        Parameters
+        ----------
+        structures : Iterable[Unit]
+            Enemy structures this step, only worth calling against Terran.
+        """
+        for structure in structures:
+            if structure.type_id not in LIFTABLE_TYPES or not structure.is_visible:
+                continue
+            if self._tags.get(structure.tag) != (
+                structure.type_id,
+                structure.is_flying,
+            ) or (
+                structure.is_flying
+                and self._positions[structure.type_id][structure.tag]
+                != structure.position
+            ):
+                self.add(structure)
+
+    def closest_to(
+        self, position: Point2, type_ids: set[UnitTypeId] | None = None
+    ) -> Point2 | None:
+        """Last known position of the structure closest to `position`.
+
+        Only searched again after the tracker changed, otherwise this is a
+        dict lookup.
+
+        Parameters
+        ----------
+        position : Point2
+            Where to measure from.
+        type_ids : set[UnitTypeId] | None
+            Structure types to consider, all of them if None.
+
+        Returns
+        -------
+        Point2 | None
+            None if no structure of `type_ids` is known.
+        """
+        key = (position, frozenset(type_ids) if type_ids is not None else None)
+        cached: tuple[int, Point2 | None] | None = self._closest_cache.get(key)
+        if cached and cached[0] == self._version:
+            return cached[1]
+
+        closest: Point2 | None = None
+        closest_distance_sq: float = float("inf")
+        for type_id in self._positions if type_ids is None else type_ids:
+            for structure_position in self._positions.get(type_id, {}).values():
+                distance_sq: float = (structure_position.x - position.x) ** 2 + (
+                    structure_position.y - position.y
+                ) ** 2
+                if distance_sq < closest_distance_sq:
+                    closest, closest_distance_sq = structure_position, distance_sq
+        self._closest_cache[key] = (self._version, closest)
+        return closest
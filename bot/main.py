@@ -1,29 +1,37 @@
-import importlib
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from loguru import logger
 
 from ares import AresBot
 from ares.behaviors.macro import Mining
 from sc2.data import Race
+from sc2.ids.unit_typeid import UnitTypeId
 from sc2.unit import Unit
 from src.ares.consts import UnitRole
 
+from bot.combat.enemy_snapshot import EnemySnapshot
+from bot.combat.grid_snapshot import GridSnapshot
+from bot.combat.path_cache import PathCache
+from bot.command_filter import CommandFilter
+from bot.damage_taken import DamageTaken
+from bot.enemy_structure_tracker import EnemyStructureTracker
+from bot.map_cache import ProxyPaths
+from bot.opening_registry import OpeningRegistry, configured_openings
+from bot.openings.opening_base import OPENING_HOOKS, build_hook_table
+from bot.startup_profiler import finish_import_profiling, mark
+from bot.step_scheduler import StepScheduler
+from bot.structure_index import StructureIndex
+from bot.unit_index import UnitIndex
 
-def _to_snake(name: str) -> str:
-    # Convert e.g. "OneBaseTempest" -> "one_base_tempest"
-    out = []
-    for i, c in enumerate(name):
-        if i > 0:
-            prev = name[i - 1]
-            nxt = name[i + 1] if i + 1 < len(name) else ""
-            if c.isupper() and (
-                (not prev.isupper())  # lower->Upper
-                or (prev.isupper() and nxt and not nxt.isupper())  # UPPER->UpperLower
-            ):
-                out.append("_")
-        out.append(c.lower())
-    return "".join(out)
+STEP_BUDGET_MS: str = "StepBudgetMs"
+LAZY_OPENINGS: str = "LazyOpenings"
+# a structure cancelled this recently isn't cancelled again
+CANCEL_RETRY_LOOPS: int = 22
+# openings switched to mid game, whatever the builds file says
+TIE_BREAK_OPENING: str = "OneBaseTempest"
+# floating Terran structures only count as a tie attempt after this
+FLOATING_ENEMY_TIME: float = 270.0
+WORKER_RUSH_OPENING: str = "ProbeRush"
 
 
 class MyBot(AresBot):
@@ -38,42 +46,87 @@ class MyBot(AresBot):
         """
         super().__init__(game_step_override)
         self.opening_handler: Optional[Any] = None
+        # hook name -> bound opening methods, resolved once per opening
+        self._opening_hooks: dict[str, tuple[Callable, ...]] = {
+            hook: () for hook in OPENING_HOOKS
+        }
         self.opening_chat_tag: bool = False
         self._switched_to_prevent_tie: bool = False
         self._switched_due_to_worker_rush: bool = False
+        self.command_filter: CommandFilter = CommandFilter()
+        self.step_scheduler: StepScheduler = StepScheduler()
+        self.damage_taken: DamageTaken = DamageTaken()
+        self.enemy_structure_tracker: EnemyStructureTracker = EnemyStructureTracker()
+        self.path_cache: PathCache = PathCache()
+        self.proxy_paths: ProxyPaths = ProxyPaths(self)
+        # built on first use each game loop
+        self._enemy_snapshot: Optional[EnemySnapshot] = None
+        self._grid_snapshot: Optional[GridSnapshot] = None
+        self._structure_index: Optional[StructureIndex] = None
+        self._unit_index: Optional[UnitIndex] = None
+        # structure tag -> game loop it was cancelled on
+        self._cancelled_at: dict[int, int] = {}
+        # import openings now, so a mid game switch only builds an object
+        self.opening_registry: OpeningRegistry = OpeningRegistry()
+        preload: list[str] = [TIE_BREAK_OPENING, WORKER_RUSH_OPENING]
+        if not self.config.get(LAZY_OPENINGS, False):
+            preload = configured_openings() + preload
+        # with lazy openings the chosen one is imported in `on_start`
+        self.opening_registry.preload(dict.fromkeys(preload))
 
     def load_opening(self, opening_name: str) -> None:
         """Load opening from bot.openings.<snake_case> with class <PascalCase>"""
-        module_path = f"bot.openings.{_to_snake(opening_name)}"
-        module = importlib.import_module(module_path)
-        opening_cls = getattr(module, opening_name, None)
-        if opening_cls is None:
-            raise ImportError(
-                f"Opening class '{opening_name}' not found in '{module_path}'"
-            )
-        self.opening_handler = opening_cls()
+        self.opening_handler = self.opening_registry.get(opening_name)()
+        self._opening_hooks = {hook: () for hook in OPENING_HOOKS}
+
+    async def start_opening(self, opening_name: str) -> None:
+        """Load and start an opening, then resolve its event hooks.
+
+        Nested openings are usually created in `on_start`, so the hook
+        table is built after it.
+        """
+        self.load_opening(opening_name)
+        if hasattr(self.opening_handler, "on_start"):
+            await self.opening_handler.on_start(self)
+        self._opening_hooks = build_hook_table(self.opening_handler)
 
     async def on_start(self) -> None:
+        mark("on_start")
         await super(MyBot, self).on_start()
+        if STEP_BUDGET_MS in self.config:
+            self.step_scheduler.budget_ms = float(self.config[STEP_BUDGET_MS])
         # Ares has initialized BuildOrderRunner at this point
         try:
-            self.load_opening(self.build_order_runner.chosen_opening)
-            if hasattr(self.opening_handler, "on_start"):
-                await self.opening_handler.on_start(self)
+            await self.start_opening(self.build_order_runner.chosen_opening)
         except Exception as exc:
             print(f"Failed to load opening: {exc}")
 
     async def on_step(self, iteration: int) -> None:
+        try:
+            await self._step(iteration)
+        finally:
+            # damage is per step, even if the step ended early
+            self.damage_taken.clear()
+
+    async def _step(self, iteration: int) -> None:
+        self.step_scheduler.begin_step()
+        if iteration == 0:
+            logger.info(f"First step {mark('first on_step'):.0f}ms after process start")
+            if report := finish_import_profiling():
+                logger.info(f"Import profile written to {report}")
         await super(MyBot, self).on_step(iteration)
         if self.supply_used < 1:
             await self.client.leave()
         self.register_behavior(Mining())
+        if self.enemy_race == Race.Terran and self.time >= FLOATING_ENEMY_TIME:
+            # lifting off or landing in sight raises no event, flying state is
+            # only read from here on and the first sync catches up
+            self.enemy_structure_tracker.sync_liftable(self.enemy_structures)
+        self._cancel_damaged_structures()
 
         if not self._switched_to_prevent_tie and self.floating_enemy:
             self._switched_to_prevent_tie = True
-            self.load_opening("OneBaseTempest")
-            if hasattr(self.opening_handler, "on_start"):
-                await self.opening_handler.on_start(self)
+            await self.start_opening(TIE_BREAK_OPENING)
             for worker in self.workers:
                 self.mediator.assign_role(tag=worker.tag, role=UnitRole.GATHERING)
             logger.info(f"{self.time_formatted} - Switched to preventing tie")
@@ -82,11 +135,9 @@ class MyBot(AresBot):
             not self._switched_due_to_worker_rush
             and self.mediator.get_enemy_worker_rushed
         ):
-            self.load_opening("ProbeRush")
             self.build_order_runner.set_build_completed()
             self.mediator.get_building_tracker_dict.clear()
-            if hasattr(self.opening_handler, "on_start"):
-                await self.opening_handler.on_start(self)
+            await self.start_opening(WORKER_RUSH_OPENING)
             self._switched_due_to_worker_rush = True
 
         if self.opening_handler and hasattr(self.opening_handler, "on_step"):
@@ -99,45 +150,121 @@ class MyBot(AresBot):
             await self.chat_send(f"Tag: {self.race.name}", team_only=True)
             self.opening_chat_tag = True
 
+        # drop commands that repeat a unit's current order
+        self.command_filter.apply(self)
+
+    def _cancel_damaged_structures(self) -> None:
+        """One cancel decision per structure damaged since the last step,
+        on its final health."""
+        game_loop: int = self.state.game_loop
+        for unit in self.damage_taken.units.values():
+            if (
+                not unit.is_structure
+                or unit.build_progress < 0.08
+                or game_loop - self._cancelled_at.get(unit.tag, -CANCEL_RETRY_LOOPS)
+                < CANCEL_RETRY_LOOPS
+            ):
+                continue
+            compare_health: float = max(
+                50.0, (unit.health_max + unit.shield_max) * 0.09
+            )
+            if unit.health < compare_health:
+                self._cancelled_at[unit.tag] = game_loop
+                self.mediator.cancel_structure(structure=unit)
+                for hook in self._opening_hooks["on_unit_cancelled"]:
+                    hook(unit)
+
     async def on_unit_created(self, unit: Unit) -> None:
         await super(MyBot, self).on_unit_created(unit)
-        if self.opening_handler and hasattr(self.opening_handler, "on_unit_created"):
-            self.opening_handler.on_unit_created(unit)
+        for hook in self._opening_hooks["on_unit_created"]:
+            hook(unit)
 
     async def on_unit_destroyed(self, unit_tag: int) -> None:
         await super(MyBot, self).on_unit_destroyed(unit_tag)
-        if self.opening_handler and hasattr(self.opening_handler, "on_unit_destroyed"):
-            self.opening_handler.on_unit_destroyed(unit_tag)
+        self.enemy_structure_tracker.remove(unit_tag)
+        self._cancelled_at.pop(unit_tag, None)
+        for hook in self._opening_hooks["on_unit_destroyed"]:
+            hook(unit_tag)
 
     async def on_unit_took_damage(self, unit: Unit, amount_damage_taken: float) -> None:
         await super(MyBot, self).on_unit_took_damage(unit, amount_damage_taken)
-        if unit.build_progress < 0.08:
-            return
-        compare_health: float = max(50.0, (unit.health_max + unit.shield_max) * 0.09)
-        if unit.health < compare_health:
-            self.mediator.cancel_structure(structure=unit)
-            if self.opening_handler and hasattr(
-                self.opening_handler, "on_unit_cancelled"
-            ):
-                self.opening_handler.on_unit_cancelled(unit)
+        # cancelling is decided once per step, see `_cancel_damaged_structures`
+        self.damage_taken.record(unit)
+        for hook in self._opening_hooks["on_unit_took_damage"]:
+            hook(unit, amount_damage_taken)
+
+    async def on_unit_type_changed(self, unit: Unit, previous_type: UnitTypeId) -> None:
+        await super(MyBot, self).on_unit_type_changed(unit, previous_type)
+        for hook in self._opening_hooks["on_unit_type_changed"]:
+            hook(unit, previous_type)
+
+    async def on_building_construction_started(self, unit: Unit) -> None:
+        await super(MyBot, self).on_building_construction_started(unit)
+        for hook in self._opening_hooks["on_building_construction_started"]:
+            hook(unit)
 
     async def on_building_construction_complete(self, unit: Unit) -> None:
         await super(MyBot, self).on_building_construction_complete(unit)
-        if self.opening_handler and hasattr(
-            self.opening_handler, "on_building_construction_complete"
-        ):
-            self.opening_handler.on_building_construction_complete(unit)
+        for hook in self._opening_hooks["on_building_construction_complete"]:
+            hook(unit)
+
+    async def on_enemy_unit_entered_vision(self, unit: Unit) -> None:
+        await super(MyBot, self).on_enemy_unit_entered_vision(unit)
+        if unit.is_structure:
+            self.enemy_structure_tracker.add(unit)
+
+    async def on_enemy_unit_left_vision(self, unit_tag: int) -> None:
+        await super(MyBot, self).on_enemy_unit_left_vision(unit_tag)
+        # structures only leave `enemy_structures` once their snapshot is gone
+        self.enemy_structure_tracker.remove(unit_tag)
 
     @property
     def floating_enemy(self) -> bool:
-        if self.enemy_race != Race.Terran or self.time < 270.0:
+        if self.enemy_race != Race.Terran or self.time < FLOATING_ENEMY_TIME:
             return False
 
         if (
-            len([s for s in self.enemy_structures if s.is_flying]) > 0
+            self.enemy_structure_tracker.flying_count > 0
             and self.state.visibility[self.enemy_start_locations[0].rounded] != 0
             and len(self.enemy_units) < 4
         ):
             return True
 
         return False
+
+    @property
+    def enemy_snapshot(self) -> EnemySnapshot:
+        """Every enemy unit as arrays, for the current game loop."""
+        game_loop: int = self.state.game_loop
+        if self._enemy_snapshot is None or self._enemy_snapshot.game_loop != game_loop:
+            self._enemy_snapshot = EnemySnapshot.build(self.all_enemy_units, game_loop)
+        return self._enemy_snapshot
+
+    @property
+    def grid_snapshot(self) -> GridSnapshot:
+        """Pathing grids and safe spot lookups for the current game loop."""
+        game_loop: int = self.state.game_loop
+        if self._grid_snapshot is None or self._grid_snapshot.game_loop != game_loop:
+            self._grid_snapshot = GridSnapshot(
+                game_loop=game_loop, mediator=self.mediator
+            )
+        return self._grid_snapshot
+
+    @property
+    def structure_index(self) -> StructureIndex:
+        """Own structures by type and area, for the current game loop."""
+        game_loop: int = self.state.game_loop
+        if (
+            self._structure_index is None
+            or self._structure_index.game_loop != game_loop
+        ):
+            self._structure_index = StructureIndex.build(self.structures, game_loop)
+        return self._structure_index
+
+    @property
+    def unit_index(self) -> UnitIndex:
+        """KD-tree over every unit, for the current game loop."""
+        game_loop: int = self.state.game_loop
+        if self._unit_index is None or self._unit_index.game_loop != game_loop:
+            self._unit_index = UnitIndex.build(self.all_units, game_loop)
+        return self._unit_index
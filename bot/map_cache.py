@@ -0,0 +1,124 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+from sc2.position import Point2
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+CACHE_FILE: Path = Path(__file__).parent / "data" / "map_cache.json"
+NAT_TO_NAT: str = "nat_to_nat"
+ENEMY_NAT_TO_CENTRE: str = "enemy_nat_to_centre"
+PATH_NAMES: tuple[str, ...] = (NAT_TO_NAT, ENEMY_NAT_TO_CENTRE)
+
+
+@dataclass
+class ProxyPaths:
+    """Map and spawn dependent paths the proxy openings choose spots from.
+
+    Nothing is read or searched until a path is first asked for. The
+    prebuilt cache is tried then, and only a path it is missing is found
+    with live pathfinding.
+
+    Attributes
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    """
+
+    ai: "AresBot"
+    # path name -> points, None until the cache was read
+    _paths: dict[str, list[Point2]] | None = None
+
+    @classmethod
+    def live(cls, ai: "AresBot") -> "ProxyPaths":
+        """Paths found with live pathfinding only, ignoring the cache."""
+        return cls(ai=ai, _paths={})
+
+    @property
+    def nat_to_nat(self) -> list[Point2]:
+        """Ground path from our natural to the enemy natural."""
+        return self._path(
+            NAT_TO_NAT, self.ai.mediator.get_own_nat, self.ai.mediator.get_enemy_nat
+        )
+
+    @property
+    def enemy_nat_to_centre(self) -> list[Point2]:
+        """Ground path from the enemy natural to the map centre."""
+        return self._path(
+            ENEMY_NAT_TO_CENTRE,
+            self.ai.mediator.get_enemy_nat,
+            self.ai.game_info.map_center,
+        )
+
+    def to_json(self) -> dict:
+        """Every path, finding the missing ones first."""
+        return {
+            NAT_TO_NAT: [[float(x), float(y)] for x, y in self.nat_to_nat],
+            ENEMY_NAT_TO_CENTRE: [
+                [float(x), float(y)] for x, y in self.enemy_nat_to_centre
+            ],
+        }
+
+    def _path(self, name: str, start: Point2, target: Point2) -> list[Point2]:
+        if self._paths is None:
+            key: str = map_key(self.ai)
+            entry: dict = load_cache().get(key, {})
+            self._paths = {
+                n: [Point2(p) for p in entry[n]] for n in PATH_NAMES if n in entry
+            }
+            if not self._paths:
+                logger.info(f"Map cache miss for {key}, pathing live")
+        if name not in self._paths:
+            path: list[Point2] | None = self.ai.mediator.find_raw_path(
+                start=start,
+                target=target,
+                grid=self.ai.mediator.get_ground_grid,
+                sensitivity=1,
+            )
+            self._paths[name] = [Point2(p) for p in path or []]
+        return self._paths[name]
+
+
+def map_key(ai: "AresBot") -> str:
+    """Cache key made of map name, a hash of the map's grids and the spawns.
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+
+    Returns
+    -------
+    str
+    """
+    digest = hashlib.sha1()
+    digest.update(ai.game_info.placement_grid.data_numpy.tobytes())
+    digest.update(ai.game_info.pathing_grid.data_numpy.tobytes())
+    own: Point2 = ai.start_location
+    enemy: Point2 = ai.enemy_start_locations[0]
+    return (
+        f"{ai.game_info.map_name}|{digest.hexdigest()[:16]}"
+        f"|{own.x},{own.y}|{enemy.x},{enemy.y}"
+    )
+
+
+def load_cache(path: Path = CACHE_FILE) -> dict[str, dict]:
+    if not path.is_file():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as exc:
+        logger.warning(f"Ignoring map cache at {path}: {exc}")
+        return {}
+
+
+def save_cache(cache: dict[str, dict], path: Path = CACHE_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
@@ -0,0 +1,121 @@
+import importlib
+import inspect
+from dataclasses import dataclass, field
+from os import path
+from time import perf_counter
+from typing import Iterable
+
+import yaml
+from loguru import logger
+
+BUILDS_FILE: str = "protoss_builds.yml"
+BUILD_CHOICES: str = "BuildChoices"
+CYCLE: str = "Cycle"
+
+
+def _to_snake(name: str) -> str:
+    # Convert e.g. "OneBaseTempest" -> "one_base_tempest"
+    out = []
+    for i, c in enumerate(name):
+        if i > 0:
+            prev = name[i - 1]
+            nxt = name[i + 1] if i + 1 < len(name) else ""
+            if c.isupper() and (
+                (not prev.isupper())  # lower->Upper
+                or (prev.isupper() and nxt and not nxt.isupper())  # UPPER->UpperLower
+            ):
+                out.append("_")
+        out.append(c.lower())
+    return "".join(out)
+
+
+def configured_openings(builds_path: str = BUILDS_FILE) -> list[str]:
+    """Every opening named in a `Cycle` under `BuildChoices`, in file order.
+
+    Parameters
+    ----------
+    builds_path : str
+        Path to the race's builds file.
+
+    Returns
+    -------
+    list[str]
+        Opening class names, without duplicates. Empty if the file is
+        missing.
+    """
+    if not path.isfile(builds_path):
+        return []
+    with open(builds_path) as builds_file:
+        config: dict = yaml.safe_load(builds_file) or {}
+
+    names: dict[str, None] = {}
+    for choice in (config.get(BUILD_CHOICES) or {}).values():
+        for name in (choice or {}).get(CYCLE) or []:
+            names[name] = None
+    return list(names)
+
+
+@dataclass
+class OpeningRegistry:
+    """Opening classes by name, imported ahead of time where possible.
+
+    Attributes
+    ----------
+    classes : dict[str, type]
+        Imported and validated opening classes.
+    import_ms : dict[str, float]
+        How long importing each opening's module took.
+    """
+
+    classes: dict[str, type] = field(default_factory=dict)
+    import_ms: dict[str, float] = field(default_factory=dict)
+
+    def preload(self, opening_names: Iterable[str]) -> None:
+        """Import and validate `opening_names`, logging how long each took.
+
+        A broken opening is logged and skipped here, so the game can still
+        start with the others. It raises again if it is ever requested.
+        """
+        for name in opening_names:
+            try:
+                self.get(name)
+            except Exception as exc:
+                logger.error(f"Failed to preload opening {name}: {exc}")
+                continue
+            logger.info(f"Preloaded {name} in {self.import_ms[name]:.1f}ms")
+
+    def get(self, opening_name: str) -> type:
+        """Return the opening class, importing it first if needed.
+
+        Parameters
+        ----------
+        opening_name : str
+            Class name, found in `bot.openings.<snake_case>`.
+
+        Returns
+        -------
+        type
+        """
+        if opening_name in self.classes:
+            return self.classes[opening_name]
+
+        module_path: str = f"bot.openings.{_to_snake(opening_name)}"
+        start: float = perf_counter()
+        module = importlib.import_module(module_path)
+        self.import_ms[opening_name] = (perf_counter() - start) * 1000.0
+
+        opening_cls = getattr(module, opening_name, None)
+        if opening_cls is None:
+            raise ImportError(
+                f"Opening class '{opening_name}' not found in '{module_path}'"
+            )
+        if inspect.isabstract(opening_cls) or not all(
+            callable(getattr(opening_cls, hook, None))
+            for hook in ("on_start", "on_step")
+        ):
+            raise ImportError(
+                f"Opening class '{opening_name}' can't run, it needs concrete "
+                f"on_start and on_step"
+            )
+        self.classes[opening_name] = opening_cls
+        return opening_cls
@@ -1,7 +1,10 @@
+from typing import Callable
+
 import numpy as np
 from ares import AresBot
 from ares.behaviors.combat import CombatManeuver
-from ares.behaviors.combat.individual import AMove, KeepUnitSafe
+from ares.behaviors.combat.group import AMoveGroup
+from ares.behaviors.combat.individual import AMove
 from ares.behaviors.macro import (
     AutoSupply,
     BuildWorkers,
@@ -17,8 +20,13 @@ from sc2.ids.unit_typeid import UnitTypeId
 from sc2.ids.upgrade_id import UpgradeId
 from sc2.position import Point2
 from sc2.unit import Unit
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import KDTree
 
 from bot.combat.base_combat import BaseCombat
+from bot.combat.grid_queries import positions_safe
+from bot.combat.grid_snapshot import GridKind, GridSnapshot
+from bot.combat.keep_unit_safe_shared import KeepUnitSafeShared
 from bot.openings.opening_base import OpeningBase
 
 REQUIRED_UPGRADES: list[UpgradeId] = [
@@ -29,6 +37,8 @@ REQUIRED_UPGRADES: list[UpgradeId] = [
     UpgradeId.PROTOSSAIRWEAPONSLEVEL3,
     UpgradeId.PROTOSSAIRARMORSLEVEL3,
 ]
+# carriers this close to each other move as one group
+CLUSTER_RADIUS: float = 9.0
 
 
 class Carriers(OpeningBase):
@@ -62,7 +72,8 @@ class Carriers(OpeningBase):
 
         self.micro(target)
 
-        self._macro()
+        if self.ai.step_scheduler.should_run("macro", every=1):
+            self._macro()
 
         self._chrono_boosts({UnitTypeId.STARGATE})
 
@@ -139,21 +150,80 @@ class Carriers(OpeningBase):
         carriers: list[Unit] = own_army_dict[UnitTypeId.CARRIER]
 
         if carriers:
-            grid: np.ndarray = self.ai.mediator.get_air_grid
-            avoid_grid: np.ndarray = self.ai.mediator.get_air_avoidance_grid
+            grids: GridSnapshot = self.ai.grid_snapshot
             observer_target: Point2 = cy_closest_to(target, carriers).position
-            for observer in observers:
-                observer_maneuver: CombatManeuver = CombatManeuver()
-                observer_maneuver.add(KeepUnitSafe(unit=observer, grid=avoid_grid))
-                if self.ai.mediator.get_is_detected(unit=observer):
-                    observer_maneuver.add(KeepUnitSafe(unit=observer, grid=grid))
-                observer_maneuver.add(AMove(unit=observer, target=observer_target))
-                self.ai.register_behavior(observer_maneuver)
-
-            for carrier in carriers:
+            self._group_micro(observers, observer_target, grids, self._observer_at_risk)
+            self._group_micro(
+                carriers, target, grids, lambda c: c.shield_percentage < 0.3
+            )
+
+    def _group_micro(
+        self,
+        units: list[Unit],
+        target: Point2,
+        grids: GridSnapshot,
+        at_risk: Callable[[Unit], bool],
+    ) -> None:
+        """One grouped a-move per cluster of units that are safe and not
+        `at_risk`, individual maneuvers for everything else.
+
+        Clusters in danger run every step, travelling clusters are spread
+        over steps by the step scheduler.
+        """
+        if not units:
+            return
+        avoidance_grid: np.ndarray = grids.grid(GridKind.AIR_AVOIDANCE)
+        for cluster in _clusters(units, CLUSTER_RADIUS):
+            # one safety check for the whole cluster
+            safe: np.ndarray = positions_safe(
+                avoidance_grid, [u.position for u in cluster]
+            )
+            risk_flags: list[bool] = [at_risk(u) for u in cluster]
+            # the lowest tag keeps the key stable while the cluster holds
+            key: tuple[UnitTypeId, int] = (
+                cluster[0].type_id,
+                min(u.tag for u in cluster),
+            )
+            if not self.ai.step_scheduler.should_run(
+                key, urgent=not safe.all() or any(risk_flags)
+            ):
+                continue
+            group: list[Unit] = []
+            for unit, is_safe, risky in zip(cluster, safe, risk_flags):
+                if len(cluster) > 1 and is_safe and not risky:
+                    group.append(unit)
+                    continue
                 maneuver: CombatManeuver = CombatManeuver()
-                maneuver.add(KeepUnitSafe(unit=carrier, grid=avoid_grid))
-                if carrier.shield_percentage < 0.3:
-                    maneuver.add(KeepUnitSafe(unit=carrier, grid=grid))
-                maneuver.add(AMove(unit=carrier, target=target))
+                maneuver.add(KeepUnitSafeShared(unit, grids, GridKind.AIR_AVOIDANCE))
+                if risky:
+                    maneuver.add(KeepUnitSafeShared(unit, grids, GridKind.AIR))
+                maneuver.add(AMove(unit=unit, target=target))
                 self.ai.register_behavior(maneuver)
+            if group:
+                self.ai.register_behavior(
+                    AMoveGroup(
+                        group=group, group_tags={u.tag for u in group}, target=target
+                    )
+                )
+
+    def _observer_at_risk(self, observer: Unit) -> bool:
+        # detection only matters where the observer can be shot
+        return not self.ai.grid_snapshot.is_safe(
+            GridKind.AIR, observer.position
+        ) and self.ai.mediator.get_is_detected(unit=observer)
+
+
+def _clusters(units: list[Unit], radius: float) -> list[list[Unit]]:
+    """Split units into groups where each unit is within `radius` of
+    another unit in its group.
+    """
+    if len(units) == 1:
+        return [units]
+    tree: KDTree = KDTree(np.array([u.position for u in units], dtype=np.float64))
+    num_clusters, labels = connected_components(
+        tree.sparse_distance_matrix(tree, radius), directed=False
+    )
+    clusters: list[list[Unit]] = [[] for _ in range(num_clusters)]
+    for unit, label in zip(units, labels):
+        clusters[label].append(unit)
+    return clusters
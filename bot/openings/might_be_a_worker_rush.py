@@ -44,20 +44,15 @@ class MightBeAWorkerRush(OpeningBase):
         await super().on_start(ai)
         self.ground_range_combat = GroundRangeCombat(ai, ai.config, ai.mediator)
         self.probe_proxy_builder = ProbeProxyBuilder(ai, ai.config, ai.mediator)
-        self.probe_rush = ProbeRush()
+        self.probe_rush = self.add_child(ProbeRush())
         await self.probe_rush.on_start(ai)
         self._main_building_location = self.ai.start_location
         self._proxy_finished = False
         self._proxy_plan = PROXY_4G_PLAN
         self._proxy_location = self.ai.mediator.get_enemy_third
-        if path := self.ai.mediator.find_raw_path(
-            start=self.ai.mediator.get_enemy_nat,
-            target=self.ai.game_info.map_center,
-            grid=self.ai.mediator.get_ground_grid,
-            sensitivity=1,
-        ):
-            if len(path) > 45:
-                self._proxy_location = Point2(path[45])
+        path: list[Point2] = self.ai.proxy_paths.enemy_nat_to_centre
+        if len(path) > 45:
+            self._proxy_location = path[45]
 
     async def on_step(self) -> None:
         await self.probe_rush.on_step()
@@ -90,7 +85,11 @@ class MightBeAWorkerRush(OpeningBase):
                 next_item_to_build, proxy_probes
             )
 
-        if self.ai.build_order_runner.build_completed and not proxy_probe_building:
+        if (
+            self.ai.build_order_runner.build_completed
+            and not proxy_probe_building
+            and self.ai.step_scheduler.should_run("macro", every=1)
+        ):
             self._macro()
 
         _target: Point2 = self.attack_target
@@ -163,8 +162,8 @@ class MightBeAWorkerRush(OpeningBase):
                 )
             )
         ):
-            build_location = await self.ai.find_placement(
-                building=next_item_to_build, near=self._proxy_location, placement_step=1
+            build_location = await self._find_proxy_placement(
+                next_item_to_build, self._proxy_location, building_worker.tag
             )
         self.probe_proxy_builder.execute(
             proxy_probes,
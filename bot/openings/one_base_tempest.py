@@ -11,8 +11,6 @@ from ares.behaviors.macro import (
 )
 from ares.consts import UnitTreeQueryType
 from ares.managers.squad_manager import UnitSquad
-from sc2.ids.ability_id import AbilityId
-from sc2.ids.buff_id import BuffId
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.ids.upgrade_id import UpgradeId
 from sc2.units import Units
@@ -43,7 +41,8 @@ class OneBaseTempest(OpeningBase):
 
         # macro based stuff
         if self.ai.build_order_runner.build_completed:
-            self._do_tempest_macro_plan()
+            if self.ai.step_scheduler.should_run("macro", every=1):
+                self._do_tempest_macro_plan()
             self._handle_chrono_boosts()
         else:
             self.ai.register_behavior(
@@ -70,6 +69,10 @@ class OneBaseTempest(OpeningBase):
                 distances=13.5,
                 query_tree=UnitTreeQueryType.AllEnemy,
             )[0].filter(lambda u: u.type_id not in COMMON_UNIT_IGNORE_TYPES)
+            if not self.ai.step_scheduler.should_run(
+                squad.squad_id, urgent=bool(all_close_enemy)
+            ):
+                continue
             self.tempest_combat.execute(
                 units=squad.squad_units,
                 all_close_enemy=all_close_enemy,
@@ -128,25 +131,9 @@ class OneBaseTempest(OpeningBase):
 
     def _handle_chrono_boosts(self):
         if self.ai.build_order_runner.build_completed:
-            if available_nexuses := [
-                th for th in self.ai.townhalls if th.energy >= 50 and th.is_ready
-            ]:
-                target = (
-                    UnitID.GATEWAY
-                    if self.ai.mediator.get_did_enemy_rush
-                    else UnitID.STARGATE
-                )
-                if targets := [
-                    s
-                    for s in self.ai.structures
-                    if s.is_ready
-                    and not s.is_idle
-                    and s.type_id == target
-                    and not s.has_buff(BuffId.CHRONOBOOSTENERGYCOST)
-                    and s.orders
-                    and s.orders[0].progress < 0.4
-                    and (s.is_powered or s.type_id == UnitID.NEXUS)
-                ]:
-                    available_nexuses[0](
-                        AbilityId.EFFECT_CHRONOBOOSTENERGYCOST, targets[0]
-                    )
+            target: UnitID = (
+                UnitID.GATEWAY
+                if self.ai.mediator.get_did_enemy_rush
+                else UnitID.STARGATE
+            )
+            self._chrono_boosts({target}, max_progress=0.4)
@@ -1,17 +1,58 @@
 from abc import ABCMeta, abstractmethod
 from itertools import cycle
+from typing import Any, Callable
 
 from ares import AresBot
 from ares.consts import UnitRole
-from cython_extensions import cy_closest_to, cy_find_units_center_mass
-from cython_extensions.geometry import cy_distance_to
-from sc2.ids.ability_id import AbilityId
-from sc2.ids.buff_id import BuffId
+from cython_extensions import cy_find_units_center_mass
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2
+from sc2.unit import Unit
 from sc2.units import Units
 
+from bot.chrono_scheduler import ChronoScheduler
 from bot.consts import ATTACK_TARGET_IGNORE
+from bot.enemy_structure_tracker import EnemyStructureTracker
+from bot.placement_engine import PlacementEngine
+from bot.proxy_ledger import ProxyLedger
+
+MAX_PLACEMENT_CONFIRMATIONS: int = 3
+# events MyBot passes on to the opening, and to every opening nested in it
+OPENING_HOOKS: tuple[str, ...] = (
+    "on_unit_created",
+    "on_unit_destroyed",
+    "on_unit_took_damage",
+    "on_unit_cancelled",
+    "on_unit_type_changed",
+    "on_building_construction_started",
+    "on_building_construction_complete",
+)
+
+
+def build_hook_table(opening: Any) -> dict[str, tuple[Callable, ...]]:
+    """Resolve every event hook of `opening` and its children once.
+
+    Parameters
+    ----------
+    opening : Any
+        The running opening, children registered with
+        `OpeningBase.add_child` are included depth first.
+
+    Returns
+    -------
+    dict[str, tuple[Callable, ...]]
+        Hook name -> bound methods to call, parent first. Openings that
+        don't implement a hook are left out.
+    """
+    table: dict[str, list[Callable]] = {hook: [] for hook in OPENING_HOOKS}
+    pending: list[Any] = [opening]
+    while pending:
+        current: Any = pending.pop(0)
+        for hook in OPENING_HOOKS:
+            if method := getattr(current, hook, None):
+                table[hook].append(method)
+        pending[:0] = getattr(current, "children", ())
+    return {hook: tuple(methods) for hook, methods in table.items()}
 
 
 class OpeningBase(metaclass=ABCMeta):
@@ -21,6 +62,17 @@ class OpeningBase(metaclass=ABCMeta):
         super().__init__()
         self.expansions_generator = None
         self.current_base_target: Point2 = Point2((0, 0))
+        # attack target is memoized per game loop
+        self._attack_target: Point2 = Point2((0, 0))
+        self._attack_target_game_loop: int = -1
+        self.attack_target_hits: int = 0
+        self.attack_target_misses: int = 0
+        # proxy location -> structures started there
+        self._proxy_ledgers: dict[Point2, ProxyLedger] = {}
+        self._placement_engines: dict[Point2, PlacementEngine] = {}
+        self._chrono_schedulers: dict[frozenset[UnitTypeId], ChronoScheduler] = {}
+        # nested openings, they get every event this opening gets
+        self.children: list["OpeningBase"] = []
 
     @abstractmethod
     async def on_start(self, ai: AresBot) -> None:
@@ -31,6 +83,14 @@ class OpeningBase(metaclass=ABCMeta):
     async def on_step(self) -> None:
         pass
 
+    def add_child(self, opening: "OpeningBase") -> "OpeningBase":
+        """Nest `opening` in this one so MyBot sends it events too.
+
+        The parent still decides when the child starts and steps.
+        """
+        self.children.append(opening)
+        return opening
+
     def _handle_proxy_probe_assignment(
         self, max_proxy_workers: int, proxy_location: Point2
     ) -> Units:
@@ -49,6 +109,22 @@ class OpeningBase(metaclass=ABCMeta):
 
     @property
     def attack_target(self) -> Point2:
+        """Attack target for this game loop, only computed on first access.
+
+        Computing it once per loop also means the expansion cycle advances
+        at most once per loop, regardless of how many units read it.
+        """
+        game_loop: int = self.ai.state.game_loop
+        if self._attack_target_game_loop == game_loop:
+            self.attack_target_hits += 1
+            return self._attack_target
+
+        self.attack_target_misses += 1
+        self._attack_target = self._find_attack_target()
+        self._attack_target_game_loop = game_loop
+        return self._attack_target
+
+    def _find_attack_target(self) -> Point2:
         enemy_units: Units = self.ai.enemy_units.filter(
             lambda u: u.type_id not in ATTACK_TARGET_IGNORE
             and not u.is_flying
@@ -59,11 +135,11 @@ class OpeningBase(metaclass=ABCMeta):
         center_mass: Point2 = self.ai.start_location
         if enemy_units:
             center_mass, num_units = cy_find_units_center_mass(enemy_units, 12.5)
-        enemy_structures: Units = self.ai.enemy_structures
+        enemy_structures: EnemyStructureTracker = self.ai.enemy_structure_tracker
         if num_units > 5:
             return Point2(center_mass)
         elif enemy_structures and self.ai.time > 120.0:
-            return cy_closest_to(self.ai.start_location, enemy_structures).position
+            return enemy_structures.closest_to(self.ai.start_location)
         elif (
             self.ai.time < 150.0
             or self.ai.state.visibility[self.ai.enemy_start_locations[0].rounded] == 0
@@ -82,53 +158,82 @@ class OpeningBase(metaclass=ABCMeta):
 
             return self.current_base_target
 
-    def _chrono_boosts(self, target_structures: set[UnitTypeId]):
-        if available_nexuses := [
-            th for th in self.ai.townhalls if th.energy >= 50 and th.is_ready
-        ]:
-            if targets := sorted(
-                [
-                    s
-                    for s in self.ai.structures
-                    if s.is_ready
-                    and s.type_id in target_structures
-                    and not s.is_idle
-                    and not s.has_buff(BuffId.CHRONOBOOSTENERGYCOST)
-                    and s.orders
-                    and s.orders[0].progress < 0.7
-                    and s.is_powered
-                ],
-                key=lambda x: x.orders[0].progress,
-            ):
-                target = targets[0]
-                available_nexuses[0](AbilityId.EFFECT_CHRONOBOOSTENERGYCOST, target)
-
-    def _count_started_at_proxy(
-        self, unit_id: UnitTypeId, target: Point2, radius: float = 18.0
-    ) -> int:
+    def _chrono_boosts(
+        self, target_structures: set[UnitTypeId], max_progress: float = 0.7
+    ) -> None:
+        key: frozenset[UnitTypeId] = frozenset(target_structures)
+        if key not in self._chrono_schedulers:
+            self._chrono_schedulers[key] = ChronoScheduler.build(
+                target_structures, self.ai.structures, max_progress
+            )
+        scheduler: ChronoScheduler = self._chrono_schedulers[key]
+        # the threshold may differ between calls, the tracked structures don't
+        scheduler.max_progress = max_progress
+        scheduler.boost(self.ai)
+
+    def on_building_construction_started(self, unit: Unit) -> None:
+        for ledger in self._proxy_ledgers.values():
+            ledger.add(unit)
+
+    def on_building_construction_complete(self, unit: Unit) -> None:
+        # catches anything started before the ledger saw it
+        for ledger in self._proxy_ledgers.values():
+            ledger.add(unit)
+        for scheduler in self._chrono_schedulers.values():
+            scheduler.add(unit)
+
+    def on_unit_type_changed(self, unit: Unit, previous_type: UnitTypeId) -> None:
+        # e.g. gateway -> warpgate
+        for scheduler in self._chrono_schedulers.values():
+            scheduler.add(unit)
+
+    def on_unit_cancelled(self, unit: Unit) -> None:
+        for ledger in self._proxy_ledgers.values():
+            ledger.remove(unit.tag)
+
+    def on_unit_destroyed(self, unit_tag: int) -> None:
+        for ledger in self._proxy_ledgers.values():
+            ledger.remove(unit_tag)
+        for scheduler in self._chrono_schedulers.values():
+            scheduler.remove(unit_tag)
+
+    def _proxy_ledger(self, target: Point2) -> ProxyLedger:
+        if target not in self._proxy_ledgers:
+            self._proxy_ledgers[target] = ProxyLedger.build(target, self.ai.structures)
+        return self._proxy_ledgers[target]
+
+    def _count_started_at_proxy(self, unit_id: UnitTypeId, target: Point2) -> int:
         """Counts structures of type unit_id that are started (under construction or ready) near target."""
-        structures = self.ai.mediator.get_own_structures_dict[unit_id]
-        if len(structures) == 0:
-            return 0
-        return len(
-            [s for s in structures if cy_distance_to(target, s.position) < radius]
-        )
+        return self._proxy_ledger(target).counts.get(unit_id, 0)
 
     def _next_build_target(
         self, plan: list[tuple[UnitTypeId, int]], target: Point2
     ) -> UnitTypeId | None:
-        """Given a normalized plan, returns the next (unit_id, remaining_for_this_step).
+        """Given a normalized plan, returns the next unit_id to build at target.
         Ensures all previous steps are satisfied before moving on.
         """
-        # cumulative approach: for each step, ensure that total built of that type at proxy
-        # meets the sum of counts up to that step for that same type
-        progress_per_type: dict[UnitTypeId, int] = {}
-        for unit_id, count in plan:
-            current_built = self._count_started_at_proxy(unit_id, target)
-            already_required = progress_per_type.get(unit_id, 0)
-            step_goal_total = already_required + count
-            if current_built < step_goal_total:
-                # still need to build for this step
-                return unit_id
-            progress_per_type[unit_id] = step_goal_total
+        return self._proxy_ledger(target).next_build_target(plan)
+
+    async def _find_proxy_placement(
+        self, building: UnitTypeId, target: Point2, builder_tag: int = 0
+    ) -> Point2 | None:
+        """Placement for building near target without querying the client.
+
+        Only once the client has rejected one of our spots are the next
+        candidates confirmed with it before they are used.
+        """
+        if target not in self._placement_engines:
+            self._placement_engines[target] = PlacementEngine.build(self.ai, target)
+        engine: PlacementEngine = self._placement_engines[target]
+
+        for _ in range(MAX_PLACEMENT_CONFIRMATIONS):
+            location: Point2 | None = engine.find_placement(
+                self.ai, building, builder_tag
+            )
+            if not location or not engine.needs_confirmation:
+                return location
+            if await self.ai.can_place_single(building, location):
+                engine.needs_confirmation = False
+                return location
+            engine.reject(location, self.ai.state.game_loop)
         return None
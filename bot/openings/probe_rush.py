@@ -1,23 +1,31 @@
 import numpy as np
 from ares import AresBot
 from ares.behaviors.combat.individual import (
-    PathUnitToTarget,
     WorkerKiteBack,
 )
 from ares.behaviors.macro import BuildWorkers
 from ares.consts import UnitRole, UnitTreeQueryType
 from ares.managers.squad_manager import UnitSquad
-from cython_extensions.geometry import cy_distance_to_squared
 from cython_extensions.units_utils import cy_closest_to
+from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.combat.base_combat import BaseCombat
+from bot.combat.grid_queries import closest_safe_spots, positions_safe
+from bot.combat.grid_snapshot import GridKind, GridSnapshot
+from bot.combat.path_unit_to_target_shared import PathUnitToTargetShared
 from bot.combat.worker_combat import WorkerCombat
 from bot.consts import COMMON_UNIT_IGNORE_TYPES
 from bot.openings.opening_base import OpeningBase
 
+# low shield workers retreat when this crowded
+NEARBY_DISTANCE: float = 7.5**0.5
+# workers retreat below this shield percentage, and rejoin at or above
+LOW_SHIELD_PERC: float = 0.3
+RECOVERED_SHIELD_PERC: float = 0.4
+
 
 class ProbeRush(OpeningBase):
     worker_combat: BaseCombat
@@ -26,6 +34,10 @@ class ProbeRush(OpeningBase):
     def __init__(self):
         super().__init__()
         self._low_shield_tags: set[int] = set()
+        # probes seen dropping low, even on steps the parent skipped us
+        self._low_shield_candidates: set[int] = set()
+        # workers this opening sent to attack
+        self._attacking_tags: set[int] = set()
         self._start_attack_at_time: float = 10
         self._initial_assignment: bool = False
         self._max_probes_in_attack: int = 200
@@ -58,35 +70,39 @@ class ProbeRush(OpeningBase):
             self.ai.register_behavior(BuildWorkers(200))
 
         # micro
-        grid: np.ndarray = self.ai.mediator.get_ground_grid
+        grids: GridSnapshot = self.ai.grid_snapshot
+        grid: np.ndarray = grids.grid(GridKind.GROUND)
         low_shields: Units = self.ai.mediator.get_units_from_role(
             role=UnitRole.CONTROL_GROUP_ONE
         )
-        for worker in low_shields:
-            nearby_units: list[Unit] = [
-                w
-                for w in self.ai.all_units
-                if cy_distance_to_squared(w.position, worker.position) < 7.5
-                and w.tag != worker.tag
-                and w.tag not in low_shields.tags
-            ]
-
-            if len(nearby_units) >= 4:
+        low_shield_positions: list[Point2] = [w.position for w in low_shields]
+        safe: np.ndarray = positions_safe(grid, low_shield_positions)
+        safe_spots: list[Point2 | None] = [None] * len(low_shields)
+        if not safe.all():
+            # one search for all unsafe workers
+            unsafe: np.ndarray = np.flatnonzero(~safe)
+            for i, spot in zip(
+                unsafe,
+                closest_safe_spots(grid, [low_shield_positions[i] for i in unsafe]),
+            ):
+                safe_spots[i] = spot
+        num_nearby, closest_nearby = self.ai.unit_index.neighbours_within(
+            low_shield_positions, NEARBY_DISTANCE, low_shields.tags
+        )
+        for i, worker in enumerate(low_shields):
+            if num_nearby[i] >= 4:
                 self.ai.register_behavior(
-                    WorkerKiteBack(worker, nearby_units[0], should_attack=False)
+                    WorkerKiteBack(worker, closest_nearby[i], should_attack=False)
                 )
-            elif not self.ai.mediator.is_position_safe(
-                grid=grid, position=worker.position
-            ):
+            elif not safe[i]:
                 worker.move(
-                    self.ai.mediator.find_closest_safe_spot(
-                        from_pos=worker.position, grid=grid
-                    )
+                    safe_spots[i]
+                    or grids.closest_safe_spot(GridKind.GROUND, worker.position)
                 )
             else:
                 self.ai.register_behavior(
-                    PathUnitToTarget(
-                        unit=worker, grid=grid, target=self.ai.game_info.map_center
+                    PathUnitToTargetShared(
+                        worker, grids, GridKind.GROUND, self.ai.game_info.map_center
                     )
                 )
 
@@ -114,14 +130,16 @@ class ProbeRush(OpeningBase):
                     else:
                         unit.gather(mf)
                 continue
-            target: Point2 = (
-                attack_target if squad.main_squad else pos_of_main_squad
-            )
+            target: Point2 = attack_target if squad.main_squad else pos_of_main_squad
             close_ground_enemy: Units = self.ai.mediator.get_units_in_range(
                 start_points=[squad.squad_position],
                 distances=12.5,
                 query_tree=UnitTreeQueryType.EnemyGround,
             )[0].filter(lambda u: u.type_id not in COMMON_UNIT_IGNORE_TYPES)
+            if not self.ai.step_scheduler.should_run(
+                squad.squad_id, urgent=bool(close_ground_enemy)
+            ):
+                continue
             self.worker_combat.execute(
                 units=squad.squad_units,
                 all_close_enemy=close_ground_enemy,
@@ -144,32 +162,84 @@ class ProbeRush(OpeningBase):
             self._max_probes_in_attack = 15
             self._start_attack_at_time = 0.0
 
+    def on_unit_created(self, unit: Unit) -> None:
+        if (
+            self._keep_assigning
+            and self._initial_assignment
+            and unit.type_id == UnitTypeId.PROBE
+        ):
+            self._attacking_tags.add(unit.tag)
+            self._set_role(unit.tag, UnitRole.ATTACKING)
+
+    def on_unit_took_damage(self, unit: Unit, amount_damage_taken: float) -> None:
+        # shields only drop through damage, so only damaged workers can go low
+        if (
+            unit.type_id == UnitTypeId.PROBE
+            and unit.shield_percentage < LOW_SHIELD_PERC
+        ):
+            self._low_shield_candidates.add(unit.tag)
+
+    def on_unit_destroyed(self, unit_tag: int) -> None:
+        super().on_unit_destroyed(unit_tag)
+        self._low_shield_tags.discard(unit_tag)
+        self._low_shield_candidates.discard(unit_tag)
+        self._attacking_tags.discard(unit_tag)
+
+    def _set_role(self, tag: int, role: UnitRole) -> None:
+        """Only pass actual role changes on to the mediator.
+
+        Checked against the mediator, as other managers reassign workers too.
+        """
+        if tag not in self.ai.mediator.get_unit_role_dict.get(role, ()):
+            self.ai.mediator.assign_role(tag=tag, role=role)
+
     def _assign_workers(self):
         if not self._initial_assignment:
             num_assigned: int = 0
             for worker in self.ai.workers:
                 if num_assigned >= self._max_probes_in_attack:
-                    break
-
-                self.ai.mediator.assign_role(tag=worker.tag, role=UnitRole.ATTACKING)
+                    if not self._keep_assigning:
+                        break
+                    self._attacking_tags.add(worker.tag)
+                    self._set_role(worker.tag, UnitRole.ATTACKING)
+                    continue
+
+                self._attacking_tags.add(worker.tag)
+                self._set_role(worker.tag, UnitRole.ATTACKING)
                 self.ai.mediator.remove_worker_from_mineral(worker_tag=worker.tag)
                 num_assigned += 1
+            # workers damaged before the attack started
+            for worker in self.ai.workers:
+                if worker.shield_percentage < LOW_SHIELD_PERC:
+                    self._low_shield_tags.add(worker.tag)
+                    self._set_role(worker.tag, UnitRole.CONTROL_GROUP_ONE)
+            self._low_shield_candidates.clear()
             self._initial_assignment = True
 
         else:
-            for worker in self.ai.workers:
-                if self._keep_assigning and worker.tag not in self._low_shield_tags:
-                    self.ai.mediator.assign_role(
-                        tag=worker.tag, role=UnitRole.ATTACKING
-                    )
-                shield_perc: float = worker.shield_percentage
-                if shield_perc < 0.3:
-                    self._low_shield_tags.add(worker.tag)
-                    self.ai.mediator.assign_role(
-                        tag=worker.tag, role=UnitRole.CONTROL_GROUP_ONE
-                    )
-                elif worker.tag in self._low_shield_tags and shield_perc >= 0.4:
-                    self._low_shield_tags.remove(worker.tag)
-                    self.ai.mediator.assign_role(
-                        tag=worker.tag, role=UnitRole.ATTACKING
-                    )
+            # candidates may have recovered since, check their shields now
+            for tag in self._low_shield_candidates - self._low_shield_tags:
+                candidate: Unit | None = self.ai.unit_tag_dict.get(tag)
+                if candidate and candidate.shield_percentage < LOW_SHIELD_PERC:
+                    self._low_shield_tags.add(tag)
+                    self._set_role(tag, UnitRole.CONTROL_GROUP_ONE)
+            self._low_shield_candidates.clear()
+            # only workers already in the low band need checking for recovery
+            for tag in list(self._low_shield_tags):
+                worker: Unit | None = self.ai.unit_tag_dict.get(tag)
+                if worker is None:
+                    self._low_shield_tags.discard(tag)
+                elif worker.shield_percentage >= RECOVERED_SHIELD_PERC:
+                    self._low_shield_tags.remove(tag)
+                    self._set_role(tag, UnitRole.ATTACKING)
+                else:
+                    self._set_role(tag, UnitRole.CONTROL_GROUP_ONE)
+            # reclaim workers other managers took back, a set difference
+            # rather than a pass over every worker
+            if self._keep_assigning:
+                for tag in (
+                    self._attacking_tags
+                    - self._low_shield_tags
+                    - self.ai.mediator.get_unit_role_dict.get(UnitRole.ATTACKING, set())
+                ):
+                    self.ai.mediator.assign_role(tag=tag, role=UnitRole.ATTACKING)
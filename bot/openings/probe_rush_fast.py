@@ -1,4 +1,5 @@
 from ares import AresBot
+
 from bot.openings.opening_base import OpeningBase
 from bot.openings.probe_rush import ProbeRush
 
@@ -9,7 +10,7 @@ class ProbeRushFast(OpeningBase):
 
     async def on_start(self, ai: AresBot) -> None:
         await super().on_start(ai)
-        self.probe_rush = ProbeRush()
+        self.probe_rush = self.add_child(ProbeRush())
         await self.probe_rush.on_start(ai)
 
     async def on_step(self) -> None:
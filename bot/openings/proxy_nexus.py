@@ -14,11 +14,15 @@ from bot.combat.base_combat import BaseCombat
 from bot.combat.probe_proxy_builder import ProbeProxyBuilder
 from bot.openings.opening_base import OpeningBase
 from bot.openings.probe_rush import ProbeRush
+from bot.recall_tracker import RecallTracker
+
+RECALL_AT_FRACTION: float = 0.97
 
 
 class ProxyNexus(OpeningBase):
     _proxy_location: Point2
     _recall_meetup_point: Point2
+    _recall_tracker: RecallTracker
     probe_proxy_builder: BaseCombat
     probe_rush: OpeningBase
 
@@ -36,14 +40,9 @@ class ProxyNexus(OpeningBase):
         self.probe_proxy_builder = ProbeProxyBuilder(ai, ai.config, ai.mediator)
         self._proxy_location = self.ai.mediator.get_enemy_third
         if self.ai.enemy_race in {Race.Random, Race.Zerg}:
-            if path := self.ai.mediator.find_raw_path(
-                start=self.ai.mediator.get_enemy_nat,
-                target=self.ai.game_info.map_center,
-                grid=self.ai.mediator.get_ground_grid,
-                sensitivity=1,
-            ):
-                if len(path) > 18:
-                    self._proxy_location = Point2(path[18])
+            path: list[Point2] = self.ai.proxy_paths.enemy_nat_to_centre
+            if len(path) > 18:
+                self._proxy_location = path[18]
         else:
             self._proxy_location = Point2(
                 cy_towards(
@@ -55,7 +54,8 @@ class ProxyNexus(OpeningBase):
         self._recall_meetup_point = Point2(
             cy_towards(self.ai.start_location, self.ai.main_base_ramp.top_center, 6.5)
         )
-        self.probe_rush = ProbeRush()
+        self._recall_tracker = RecallTracker(self._recall_meetup_point)
+        self.probe_rush = self.add_child(ProbeRush())
         await self.probe_rush.on_start(ai)
 
     async def on_step(self) -> None:
@@ -118,15 +118,7 @@ class ProxyNexus(OpeningBase):
                 self._recall_complete = True
 
             enough_to_recall: bool = (
-                len(
-                    [
-                        u
-                        for u in self.ai.units
-                        if cy_distance_to_squared(u.position, self._recall_meetup_point)
-                        < 15.0
-                    ]
-                )
-                >= len(self.ai.units) * 0.97
+                self._recall_tracker.update(self.ai.units) >= RECALL_AT_FRACTION
             )
 
             if enough_to_recall and self.ai.townhalls:
@@ -134,11 +126,6 @@ class ProxyNexus(OpeningBase):
                 if AbilityId.EFFECT_MASSRECALL_NEXUS in nexus.abilities:
                     nexus(AbilityId.EFFECT_MASSRECALL_NEXUS, self._recall_meetup_point)
                     self._recall_complete = True
-            for unit in self.ai.units:
-                if unit.is_carrying_resource:
-                    unit.return_resource()
-                else:
-                    unit.move(self._recall_meetup_point)
         else:
             await self.probe_rush.on_step()
             target: Point2 = self.attack_target
@@ -161,8 +148,8 @@ class ProxyNexus(OpeningBase):
             and cy_distance_to_squared(building_worker.position, self._proxy_location)
             < 144.0
         ):
-            build_location = await self.ai.find_placement(
-                building=next_item_to_build, near=self._proxy_location
+            build_location = await self._find_proxy_placement(
+                next_item_to_build, self._proxy_location, building_worker.tag
             )
 
         self.probe_proxy_builder.execute(
@@ -174,6 +161,7 @@ class ProxyNexus(OpeningBase):
         )
 
     def on_unit_cancelled(self, unit: Unit) -> None:
+        super().on_unit_cancelled(unit)
         if unit.type_id == UnitTypeId.NEXUS:
             self._start_attack = True
             self._recall_complete = True
@@ -14,6 +14,7 @@ from bot.combat.base_combat import BaseCombat
 from bot.combat.probe_proxy_builder import ProbeProxyBuilder
 from bot.consts import COMMON_UNIT_IGNORE_TYPES, PROXY_VOID_PLAN, PROXY_VOID_PLAN_B
 from bot.openings.opening_base import OpeningBase
+from bot.structure_index import StructureIndex
 
 
 class ProxyVoids(OpeningBase):
@@ -61,7 +62,9 @@ class ProxyVoids(OpeningBase):
         ):
             await self._handle_proxy_stargate_construction(proxy_probes)
 
-        if self.ai.build_order_runner.build_completed:
+        if self.ai.build_order_runner.build_completed and (
+            self.ai.step_scheduler.should_run("macro", every=1)
+        ):
             self._macro()
         self._micro()
 
@@ -79,6 +82,10 @@ class ProxyVoids(OpeningBase):
                 distances=11.5,
                 query_tree=UnitTreeQueryType.AllEnemy,
             )[0].filter(lambda u: u.type_id not in COMMON_UNIT_IGNORE_TYPES)
+            if not self.ai.step_scheduler.should_run(
+                squad.squad_id, urgent=bool(close_enemy)
+            ):
+                continue
             self.void_combat.execute(
                 units=squad.squad_units,
                 all_close_enemy=close_enemy,
@@ -132,8 +139,8 @@ class ProxyVoids(OpeningBase):
                 )
                 < 144.0
             ):
-                build_location = await self.ai.find_placement(
-                    building=next_item_to_build, near=self._proxy_location
+                build_location = await self._find_proxy_placement(
+                    next_item_to_build, self._proxy_location, building_worker.tag
                 )
 
         self.probe_proxy_builder.execute(
@@ -145,19 +152,13 @@ class ProxyVoids(OpeningBase):
         )
 
     def on_unit_destroyed(self, unit_tag: int) -> None:
+        super().on_unit_destroyed(unit_tag)
         if unit_tag == self._primary_builder_tag:
             self._primary_builder_tag = 0
 
     def _heal_structures(self):
-        require_healing: list[Unit] = [
-            s
-            for s in self.ai.structures
-            if s.shield_percentage < 1.0
-            and s.type_id in {UnitTypeId.STARGATE, UnitTypeId.PYLON}
-        ]
-        for battery in self.ai.mediator.get_own_structures_dict[
-            UnitTypeId.SHIELDBATTERY
-        ]:
+        structure_index: StructureIndex = self.ai.structure_index
+        for battery in structure_index.by_type.get(UnitTypeId.SHIELDBATTERY, []):
             if battery.is_using_ability(
                 AbilityId.SHIELDBATTERYRECHARGEEX5_SHIELDBATTERYRECHARGE
             ):
@@ -166,8 +167,10 @@ class ProxyVoids(OpeningBase):
                 continue
             can_heal: list[Unit] = [
                 r
-                for r in require_healing
-                if cy_distance_to_squared(r.position, battery.position) <= 36.0
+                for r in structure_index.in_range(
+                    {UnitTypeId.STARGATE, UnitTypeId.PYLON}, battery.position, 6.0
+                )
+                if r.shield_percentage < 1.0
             ]
             if can_heal:
                 battery(
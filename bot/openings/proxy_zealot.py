@@ -8,9 +8,15 @@ from sc2.units import Units
 from bot.combat.base_combat import BaseCombat
 from bot.combat.probe_proxy_builder import ProbeProxyBuilder
 from bot.consts import PROXY_ZEALOT_PLAN, PROXY_ZEALOT_PLAN_3G
+from bot.map_cache import ProxyPaths
 from bot.openings.opening_base import OpeningBase
 
 PATH_THRESHOLD: int = 100
+STATIC_DEFENCE: set[UnitTypeId] = {
+    UnitTypeId.PHOTONCANNON,
+    UnitTypeId.SPINECRAWLER,
+    UnitTypeId.BUNKER,
+}
 
 
 class ProxyZealot(OpeningBase):
@@ -64,13 +70,10 @@ class ProxyZealot(OpeningBase):
         macro_plan.add(BuildWorkers(15))
         self.ai.register_behavior(macro_plan)
 
-        if static_def := [
-            s
-            for s in self.ai.enemy_structures
-            if s.type_id
-            in {UnitTypeId.PHOTONCANNON, UnitTypeId.SPINECRAWLER, UnitTypeId.BUNKER}
-        ]:
-            target: Point2 = cy_closest_to(self._proxy_location, static_def).position
+        if static_def := self.ai.enemy_structure_tracker.closest_to(
+            self._proxy_location, STATIC_DEFENCE
+        ):
+            target: Point2 = static_def
         elif self.ai.time < 240.0:
             target: Point2 = self.ai.enemy_start_locations[0]
         else:
@@ -99,8 +102,8 @@ class ProxyZealot(OpeningBase):
                 )
                 < 144.0
             ):
-                build_location = await self.ai.find_placement(
-                    building=next_item_to_build, near=self._proxy_location
+                build_location = await self._find_proxy_placement(
+                    next_item_to_build, self._proxy_location, building_worker.tag
                 )
 
         self.probe_proxy_builder.execute(
@@ -112,6 +115,7 @@ class ProxyZealot(OpeningBase):
         )
 
     def on_unit_destroyed(self, unit_tag: int) -> None:
+        super().on_unit_destroyed(unit_tag)
         if unit_tag == self._primary_builder_tag:
             self._primary_builder_tag = 0
 
@@ -125,21 +129,10 @@ class ProxyZealot(OpeningBase):
         )
         if self.ai.build_order_runner.chosen_opening == "ProxyZealotInMain":
             return enemy_main_proxy_loc
-        elif path := self.ai.mediator.find_raw_path(
-            start=self.ai.mediator.get_own_nat,
-            target=self.ai.mediator.get_enemy_nat,
-            grid=self.ai.mediator.get_ground_grid,
-            sensitivity=1,
-        ):
+        paths: ProxyPaths = self.ai.proxy_paths
+        if path := paths.nat_to_nat:
             if len(path) <= PATH_THRESHOLD:
                 return enemy_main_proxy_loc
-            else:
-                if path := self.ai.mediator.find_raw_path(
-                    start=self.ai.mediator.get_enemy_nat,
-                    target=self.ai.game_info.map_center,
-                    grid=self.ai.mediator.get_ground_grid,
-                    sensitivity=1,
-                ):
-                    if len(path) > 18:
-                        return Point2(path[18])
+            elif len(paths.enemy_nat_to_centre) > 18:
+                return paths.enemy_nat_to_centre[18]
         return self.ai.mediator.get_enemy_nat
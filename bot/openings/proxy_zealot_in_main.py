@@ -9,11 +9,8 @@ class ProxyZealotInMain(OpeningBase):
 
     async def on_start(self, ai: AresBot) -> None:
         await super().on_start(ai)
-        self.proxy_zealot = ProxyZealot()
+        self.proxy_zealot = self.add_child(ProxyZealot())
         await self.proxy_zealot.on_start(ai)
 
     async def on_step(self) -> None:
         await self.proxy_zealot.on_step()
-
-    def on_unit_destroyed(self, unit_tag):
-        self.proxy_zealot.on_unit_destroyed(unit_tag)
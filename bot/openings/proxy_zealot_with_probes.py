@@ -14,9 +14,9 @@ class ProxyZealotWithProbes(OpeningBase):
     async def on_start(self, ai: AresBot) -> None:
         await super().on_start(ai)
         self._worker_rush_activated = False
-        self.probe_rush = ProbeRush()
+        self.probe_rush = self.add_child(ProbeRush())
         await self.probe_rush.on_start(ai)
-        self.proxy_zealot = ProxyZealot()
+        self.proxy_zealot = self.add_child(ProxyZealot())
         await self.proxy_zealot.on_start(ai)
 
     async def on_step(self) -> None:
@@ -38,6 +38,3 @@ class ProxyZealotWithProbes(OpeningBase):
         await self.proxy_zealot.on_step()
         if self._worker_rush_activated:
             await self.probe_rush.on_step()
-
-    def on_unit_destroyed(self, unit_tag):
-        self.proxy_zealot.on_unit_destroyed(unit_tag)
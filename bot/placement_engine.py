@@ -0,0 +1,212 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+from cython_extensions import cy_pylon_matrix_covers
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from sc2.units import Units
+from scipy.ndimage import binary_dilation
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+PLACEMENT_RADIUS: int = 12
+# rejected spots are retried after this, blockers such as units move on
+REJECT_FOR_LOOPS: int = 224
+# townhalls can not be placed this close to resources
+TOWNHALL_RESOURCE_GAP: int = 3
+NO_POWER_NEEDED: set[UnitTypeId] = {
+    UnitTypeId.PYLON,
+    UnitTypeId.NEXUS,
+    UnitTypeId.ASSIMILATOR,
+}
+PYLON_POWER_RADIUS: float = 6.5
+
+
+@dataclass
+class PlacementEngine:
+    """Local building placement around a single location.
+
+    Candidate footprints that fit the static placement grid are worked out
+    once. Each query then only checks them against the structures and
+    resources near the location and, where needed, pylon power, so no
+    query round trip to the client is needed. When the client rejects a
+    spot we handed out (seen through `state.action_errors`) that spot is
+    dropped for a while and `needs_confirmation` is set, so the caller can
+    confirm the next candidate with the client before using it.
+
+    Attributes
+    ----------
+    location : Point2
+        Buildings are placed as close to this as possible.
+    origin : tuple[int, int]
+        Grid coordinates of the [0, 0] cell of the local window.
+    placeable : np.ndarray
+        Static placement grid for the window, indexed [x, y].
+    needs_confirmation : bool
+        Set once the client rejected a spot handed out by this engine.
+    """
+
+    location: Point2
+    origin: tuple[int, int]
+    placeable: np.ndarray
+    needs_confirmation: bool = False
+    # footprint size -> candidate centres sorted by distance to location
+    _candidates: dict[int, list[Point2]] = field(default_factory=dict)
+    _rejected: dict[Point2, int] = field(default_factory=dict)
+    # creation ability -> (spot, builder tag)
+    _handed_out: dict[int, tuple[Point2, int]] = field(default_factory=dict)
+    _errors_game_loop: int = -1
+    _occupied: np.ndarray | None = None
+    _near_resources: np.ndarray | None = None
+    _occupied_game_loop: int = -1
+
+    @classmethod
+    def build(
+        cls, ai: "AresBot", location: Point2, radius: int = PLACEMENT_RADIUS
+    ) -> "PlacementEngine":
+        # placement grid is indexed [y, x]
+        grid: np.ndarray = ai.game_info.placement_grid.data_numpy.T == 1
+        x_min: int = max(int(location.x) - radius, 0)
+        y_min: int = max(int(location.y) - radius, 0)
+        x_max: int = min(int(location.x) + radius + 1, grid.shape[0])
+        y_max: int = min(int(location.y) + radius + 1, grid.shape[1])
+        return cls(
+            location=location,
+            origin=(x_min, y_min),
+            placeable=grid[x_min:x_max, y_min:y_max].copy(),
+        )
+
+    def find_placement(
+        self, ai: "AresBot", building: UnitTypeId, builder_tag: int = 0
+    ) -> Point2 | None:
+        """Closest spot to `location` that `building` fits into.
+
+        Parameters
+        ----------
+        ai : AresBot
+            Bot object that will be running the game
+        building : UnitTypeId
+            Structure to place.
+        builder_tag : int
+            Worker that will be sent to build, used to match client errors.
+
+        Returns
+        -------
+        Point2 | None
+            None if no candidate fits.
+        """
+        ability: int = ai.game_data.units[building.value].creation_ability.id.value
+        game_loop: int = ai.state.game_loop
+        self._process_errors(ai, game_loop)
+        self._update_occupied(ai, game_loop)
+
+        size: int = int(ai.game_data.units[building.value].footprint_radius * 2)
+        pylons: Units | None = None
+        if building not in NO_POWER_NEEDED:
+            pylons = ai.mediator.get_own_structures_dict[UnitTypeId.PYLON].filter(
+                lambda p: p.is_ready
+                and p.distance_to(self.location) < PLACEMENT_RADIUS + PYLON_POWER_RADIUS
+            )
+            if not pylons:
+                return None
+
+        for spot in self._candidates_for(size):
+            rejected_at: int | None = self._rejected.get(spot)
+            if rejected_at is not None and game_loop - rejected_at < REJECT_FOR_LOOPS:
+                continue
+            cells: tuple[slice, slice] = self._footprint(spot, size)
+            if self._occupied[cells].any():
+                continue
+            if building == UnitTypeId.NEXUS and self._near_resources[cells].any():
+                continue
+            if pylons and not cy_pylon_matrix_covers(
+                spot,
+                pylons,
+                ai.game_info.terrain_height.data_numpy,
+                pylon_build_progress=1.0,
+            ):
+                continue
+            self._handed_out[ability] = (spot, builder_tag)
+            return spot
+        return None
+
+    def reject(self, spot: Point2, game_loop: int) -> None:
+        """Stop handing out `spot` for `REJECT_FOR_LOOPS` game loops."""
+        self._rejected[spot] = game_loop
+        self.needs_confirmation = True
+
+    def _candidates_for(self, size: int) -> list[Point2]:
+        if size not in self._candidates:
+            # odd sized footprints sit on half cells
+            offset: float = 0.5 if size % 2 else 0.0
+            half: float = size / 2
+            spots: list[Point2] = []
+            x0, y0 = self.origin
+            for x in range(self.placeable.shape[0]):
+                for y in range(self.placeable.shape[1]):
+                    spot: Point2 = Point2((x0 + x + offset, y0 + y + offset))
+                    cells: tuple[slice, slice] = self._footprint(spot, size)
+                    if (
+                        spot.x - half >= x0
+                        and spot.y - half >= y0
+                        and self.placeable[cells].size == size * size
+                        and self.placeable[cells].all()
+                    ):
+                        spots.append(spot)
+            spots.sort(key=lambda p: p.distance_to(self.location))
+            self._candidates[size] = spots
+        return self._candidates[size]
+
+    def _footprint(self, center: Point2, size: int) -> tuple[slice, slice]:
+        x: int = int(round(center.x - size / 2)) - self.origin[0]
+        y: int = int(round(center.y - size / 2)) - self.origin[1]
+        return slice(max(x, 0), max(x + size, 0)), slice(max(y, 0), max(y + size, 0))
+
+    def _process_errors(self, ai: "AresBot", game_loop: int) -> None:
+        # `action_errors` belongs to the observation, read it once per loop
+        if game_loop == self._errors_game_loop:
+            return
+        self._errors_game_loop = game_loop
+        for error in ai.state.action_errors:
+            ability_id: int = error.ability_id
+            unit_tag: int = error.unit_tag
+            if ability_id not in self._handed_out:
+                continue
+            spot, builder_tag = self._handed_out[ability_id]
+            if builder_tag and unit_tag != builder_tag:
+                continue
+            del self._handed_out[ability_id]
+            self.reject(spot, game_loop)
+
+    def _update_occupied(self, ai: "AresBot", game_loop: int) -> None:
+        if self._occupied_game_loop == game_loop:
+            return
+        self._occupied_game_loop = game_loop
+        occupied: np.ndarray = np.zeros_like(self.placeable)
+        resources: np.ndarray = np.zeros_like(self.placeable)
+        max_distance: float = PLACEMENT_RADIUS * 1.5
+        for unit in ai.structures + ai.enemy_structures:
+            if unit.is_flying or unit.distance_to(self.location) > max_distance:
+                continue
+            radius: float | None = unit.footprint_radius
+            if radius:
+                occupied[self._footprint(unit.position, int(radius * 2))] = True
+        for mineral in ai.mineral_field:
+            if mineral.distance_to(self.location) > max_distance:
+                continue
+            # minerals are 2x1
+            x: int = int(mineral.position.x - 1) - self.origin[0]
+            y: int = int(mineral.position.y) - self.origin[1]
+            resources[max(x, 0) : max(x + 2, 0), max(y, 0) : max(y + 1, 0)] = True
+        for geyser in ai.vespene_geyser:
+            if geyser.distance_to(self.location) <= max_distance:
+                resources[self._footprint(geyser.position, 3)] = True
+        self._occupied = occupied | resources
+        # square kernel, the no townhall zone is a square around resources
+        self._near_resources = binary_dilation(
+            resources,
+            structure=np.ones((3, 3), dtype=bool),
+            iterations=TOWNHALL_RESOURCE_GAP,
+        )
@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from cython_extensions.geometry import cy_distance_to
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from sc2.unit import Unit
+
+PROXY_RADIUS: float = 18.0
+
+
+@dataclass
+class ProxyLedger:
+    """Running count of own structures started near a proxy location.
+
+    Kept up to date from structure events instead of rescanning the
+    structures dict every step.
+
+    Attributes
+    ----------
+    location : Point2
+        The proxy location.
+    radius : float
+        Structures closer than this to `location` count towards the proxy.
+    counts : dict[UnitTypeId, int]
+        Number of started (or ready) structures per type near the proxy.
+    tags : dict[int, UnitTypeId]
+        Tags of every counted structure.
+    """
+
+    location: Point2
+    radius: float = PROXY_RADIUS
+    counts: dict[UnitTypeId, int] = field(default_factory=dict)
+    tags: dict[int, UnitTypeId] = field(default_factory=dict)
+    _version: int = 0
+    # id(plan) -> (ledger version, next item)
+    _next_cache: dict[int, tuple[int, UnitTypeId | None]] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls, location: Point2, structures: Iterable[Unit], radius: float = PROXY_RADIUS
+    ) -> "ProxyLedger":
+        ledger: ProxyLedger = cls(location=location, radius=radius)
+        for structure in structures:
+            ledger.add(structure)
+        return ledger
+
+    def add(self, structure: Unit) -> None:
+        """Count `structure` if it is near the proxy and not counted yet."""
+        if structure.tag in self.tags or (
+            cy_distance_to(self.location, structure.position) >= self.radius
+        ):
+            return
+        self.tags[structure.tag] = structure.type_id
+        self.counts[structure.type_id] = self.counts.get(structure.type_id, 0) + 1
+        self._version += 1
+
+    def remove(self, tag: int) -> None:
+        """Stop counting the structure with `tag`, if it was counted."""
+        type_id: UnitTypeId | None = self.tags.pop(tag, None)
+        if type_id is None:
+            return
+        self.counts[type_id] -= 1
+        self._version += 1
+
+    def next_build_target(
+        self, plan: list[tuple[UnitTypeId, int]]
+    ) -> UnitTypeId | None:
+        """Next structure type in `plan` that is not satisfied yet.
+
+        Only re-evaluated after the ledger changed, otherwise this is a
+        dict lookup.
+
+        Parameters
+        ----------
+        plan : list[tuple[UnitTypeId, int]]
+            Build steps, counts are per step and add up per type.
+
+        Returns
+        -------
+        UnitTypeId | None
+            None if the whole plan is started.
+        """
+        cached: tuple[int, UnitTypeId | None] | None = self._next_cache.get(id(plan))
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+
+        next_item: UnitTypeId | None = None
+        progress_per_type: dict[UnitTypeId, int] = {}
+        for unit_id, count in plan:
+            step_goal_total: int = progress_per_type.get(unit_id, 0) + count
+            if self.counts.get(unit_id, 0) < step_goal_total:
+                next_item = unit_id
+                break
+            progress_per_type[unit_id] = step_goal_total
+
+        self._next_cache[id(plan)] = (self._version, next_item)
+        return next_item
@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+
+import numpy as np
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.units import Units
+
+# units this close (squared) to the meetup point count as gathered
+GATHERED_DISTANCE_SQ: float = 15.0
+# a move order ending this close to the meetup point is left alone
+ORDER_TOLERANCE: float = 1.0
+
+
+@dataclass
+class RecallTracker:
+    """Gathers every unit at a meetup point ahead of a mass recall.
+
+    Attributes
+    ----------
+    meetup_point : Point2
+        Where units gather.
+    gathered_fraction : float
+        Fraction of units within range of `meetup_point` at the last
+        `update`.
+    commands_issued : int
+        Total commands sent to units, for debugging.
+    """
+
+    meetup_point: Point2
+    gathered_fraction: float = 0.0
+    commands_issued: int = 0
+
+    def update(self, units: Units) -> float:
+        """Measure how gathered `units` are, and send the rest on their way.
+
+        Only units that are not already doing the right thing get a new
+        command.
+
+        Parameters
+        ----------
+        units : Units
+            Every own unit.
+
+        Returns
+        -------
+        float
+            Fraction of `units` within range of the meetup point.
+        """
+        if not units:
+            self.gathered_fraction = 0.0
+            return self.gathered_fraction
+
+        positions: np.ndarray = np.array([u.position for u in units], dtype=float)
+        gathered: np.ndarray = (
+            np.sum((positions - self.meetup_point) ** 2, axis=1) < GATHERED_DISTANCE_SQ
+        )
+        self.gathered_fraction = float(np.mean(gathered))
+
+        for unit, is_gathered in zip(units, gathered):
+            if unit.is_carrying_resource:
+                if not unit.is_returning:
+                    unit.return_resource()
+                    self.commands_issued += 1
+            elif not (is_gathered and unit.is_idle) and not self._moving_to_meetup(
+                unit
+            ):
+                unit.move(self.meetup_point)
+                self.commands_issued += 1
+        return self.gathered_fraction
+
+    def _moving_to_meetup(self, unit: Unit) -> bool:
+        if not unit.is_moving:
+            return False
+        target = unit.orders[0].target
+        return (
+            isinstance(target, Point2)
+            and target.distance_to(self.meetup_point) <= ORDER_TOLERANCE
+        )
@@ -0,0 +1,206 @@
+"""
+Where the time between process start and the first game step goes.
+
+Set `PROFILE_IMPORTS=1` before starting `run.py` to time every module
+import, the report is written to `IMPORT_REPORT_FILE` on the first step.
+Startup marks are always recorded, they cost next to nothing.
+
+Only the standard library is imported here, so it can be installed before
+anything else in `run.py`.
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec
+from os import path
+from types import ModuleType
+from typing import Any, Optional, Sequence
+
+PROFILE_IMPORTS_ENV: str = "PROFILE_IMPORTS"
+IMPORT_REPORT_FILE: str = path.join(
+    path.dirname(path.abspath(__file__)), "data", "import_profile.txt"
+)
+# modules in the report, slowest first
+REPORT_TOP: int = 60
+
+
+def _process_start_time() -> float:
+    """Wall clock time this process started, falls back to now."""
+    try:
+        # fields after the command name, starttime is field 22 of the file
+        with open("/proc/self/stat") as stat_file:
+            fields: list[str] = stat_file.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as uptime_file:
+            uptime: float = float(uptime_file.read().split()[0])
+        started_after_boot: float = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return time.time() - uptime + started_after_boot
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.time()
+
+
+PROCESS_START: float = _process_start_time()
+_marks: dict[str, float] = {}
+
+
+def mark(label: str) -> float:
+    """Record how long after process start `label` happened.
+
+    Only the first mark for a label is kept.
+
+    Parameters
+    ----------
+    label : str
+        What just happened, eg. "first on_step".
+
+    Returns
+    -------
+    float
+        Milliseconds since process start.
+    """
+    if label not in _marks:
+        _marks[label] = (time.time() - PROCESS_START) * 1000.0
+    return _marks[label]
+
+
+class _TimedLoader:
+    """Wraps a module's loader to time `exec_module`, everything else
+    passes straight through."""
+
+    def __init__(self, loader: Any, profiler: "ImportProfiler"):
+        self._loader: Any = loader
+        self._profiler: ImportProfiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self._profiler.begin(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.end(module.__name__)
+
+
+class _TimingFinder(MetaPathFinder):
+    """Asks the other finders for a spec and wraps its loader."""
+
+    def __init__(self, profiler: "ImportProfiler"):
+        self._profiler: ImportProfiler = profiler
+
+    def find_spec(
+        self,
+        fullname: str,
+        module_path: Optional[Sequence[str]],
+        target: Optional[ModuleType] = None,
+    ) -> Optional[ModuleSpec]:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec: Optional[ModuleSpec] = finder.find_spec(fullname, module_path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+@dataclass
+class ImportProfiler:
+    """Time spent executing each imported module.
+
+    Attributes
+    ----------
+    cumulative_ms : dict[str, float]
+        Module -> time to import it, including the imports it triggered.
+    self_ms : dict[str, float]
+        Module -> time spent in its own body only.
+    """
+
+    cumulative_ms: dict[str, float] = field(default_factory=dict)
+    self_ms: dict[str, float] = field(default_factory=dict)
+    _stack: list[list] = field(default_factory=list)
+    _finder: Optional[_TimingFinder] = None
+
+    def install(self) -> None:
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def begin(self, module_name: str) -> None:
+        # [name, start, time spent in nested imports]
+        self._stack.append([module_name, time.perf_counter(), 0.0])
+
+    def end(self, module_name: str) -> None:
+        name, start, nested_ms = self._stack.pop()
+        total_ms: float = (time.perf_counter() - start) * 1000.0
+        self.cumulative_ms[name] = total_ms
+        self.self_ms[name] = total_ms - nested_ms
+        if self._stack:
+            self._stack[-1][2] += total_ms
+
+    def write_report(self, report_path: str = IMPORT_REPORT_FILE) -> None:
+        """Write startup marks and the slowest imports to `report_path`."""
+        lines: list[str] = ["startup marks (ms since process start)"]
+        lines += [f"{ms:10.1f}  {label}" for label, ms in _marks.items()]
+        lines += [
+            "",
+            f"{len(self.cumulative_ms)} modules imported, slowest {REPORT_TOP}",
+            f"{'cumulative ms':>14}  {'self ms':>8}  module",
+        ]
+        slowest: list[str] = sorted(
+            self.cumulative_ms, key=self.cumulative_ms.get, reverse=True
+        )[:REPORT_TOP]
+        lines += [
+            f"{self.cumulative_ms[name]:14.1f}  {self.self_ms[name]:8.1f}  {name}"
+            for name in slowest
+        ]
+        os.makedirs(path.dirname(report_path), exist_ok=True)
+        with open(report_path, "w") as report_file:
+            report_file.write("\n".join(lines) + "\n")
+
+
+_profiler: Optional[ImportProfiler] = None
+
+
+def start_import_profiling() -> bool:
+    """Start timing imports if `PROFILE_IMPORTS` is set.
+
+    Returns
+    -------
+    bool
+        Whether profiling is on.
+    """
+    global _profiler
+    if _profiler is None and os.environ.get(PROFILE_IMPORTS_ENV):
+        _profiler = ImportProfiler()
+        _profiler.install()
+    return _profiler is not None
+
+
+def finish_import_profiling() -> Optional[str]:
+    """Stop timing imports and write the report.
+
+    Returns
+    -------
+    Optional[str]
+        Path of the report, None if profiling was off.
+    """
+    global _profiler
+    if _profiler is None:
+        return None
+    _profiler.uninstall()
+    _profiler.write_report()
+    _profiler = None
+    return IMPORT_REPORT_FILE
@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Hashable
+
+STALE_AFTER_STEPS: int = 224
+
+
+@dataclass
+class StepScheduler:
+    """Decide which non urgent work runs this step, to keep step time in budget.
+
+    Urgent work (eg. squads in combat) always runs. Everything else runs
+    at most once every `every` steps, is skipped once the step is over
+    `budget_ms`, and is forced through after being skipped for
+    `2 * every` steps so nothing is starved.
+
+    Parameters
+    ----------
+    budget_ms : float
+        Milliseconds per step after which deferrable work is skipped.
+    spread : int
+        Default number of steps between updates of deferrable work.
+    """
+
+    budget_ms: float = 30.0
+    spread: int = 4
+    _step: int = 0
+    _step_start: float = 0.0
+    _last_run: dict[Hashable, int] = field(default_factory=dict)
+
+    def begin_step(self) -> None:
+        """Call at the start of every step, before any scheduled work."""
+        self._step += 1
+        self._step_start = perf_counter()
+        if self._step % STALE_AFTER_STEPS == 0:
+            # forget work that stopped being scheduled, eg. dead squads
+            self._last_run = {
+                k: v
+                for k, v in self._last_run.items()
+                if self._step - v < STALE_AFTER_STEPS
+            }
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (perf_counter() - self._step_start) * 1000.0
+
+    @property
+    def over_budget(self) -> bool:
+        return self.elapsed_ms > self.budget_ms
+
+    def should_run(
+        self, key: Hashable, urgent: bool = False, every: int | None = None
+    ) -> bool:
+        """Whether the work identified by `key` should run this step.
+
+        Parameters
+        ----------
+        key : Hashable
+            Identifies the piece of work, eg. a squad id or "macro".
+        urgent : bool
+            Always run, eg. a squad with enemies close by.
+        every : int | None
+            Steps between runs when not urgent, defaults to `spread`.
+
+        Returns
+        -------
+        bool
+        """
+        every = self.spread if every is None else every
+        last_run: int | None = self._last_run.get(key)
+        since: int = self._step - last_run if last_run is not None else every * 2
+        if not (
+            urgent or since >= every * 2 or (since >= every and not self.over_budget)
+        ):
+            return False
+
+        self._last_run[key] = self._step
+        return True
@@ -0,0 +1,84 @@
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.position import Point2
+from sc2.unit import Unit
+
+CELL_SIZE: float = 8.0
+
+
+def _cell(x: float, y: float) -> tuple[int, int]:
+    return int(x // CELL_SIZE), int(y // CELL_SIZE)
+
+
+@dataclass
+class StructureIndex:
+    """Own structures grouped by type, with a coarse spatial grid per type.
+
+    Built once per game loop so range queries such as "shield batteries
+    near the squad" don't need to scan every structure.
+
+    Parameters
+    ----------
+    game_loop : int
+        The game loop this index was built on.
+    """
+
+    game_loop: int
+    by_type: dict[UnitID, list[Unit]] = field(default_factory=dict)
+    _cells: dict[UnitID, dict[tuple[int, int], list[Unit]]] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def build(cls, structures: Iterable[Unit], game_loop: int) -> "StructureIndex":
+        index = cls(game_loop=game_loop)
+        for structure in structures:
+            type_id: UnitID = structure.type_id
+            index.by_type.setdefault(type_id, []).append(structure)
+            x, y = structure.position
+            index._cells.setdefault(type_id, {}).setdefault(_cell(x, y), []).append(
+                structure
+            )
+        return index
+
+    def in_range(
+        self,
+        type_ids: UnitID | set[UnitID],
+        position: Point2 | tuple[float, float],
+        distance: float,
+    ) -> list[Unit]:
+        """Structures of `type_ids` within `distance` of `position`.
+
+        Parameters
+        ----------
+        type_ids : UnitID | set[UnitID]
+            Structure type(s) to look for.
+        position : Point2 | tuple[float, float]
+            Centre of the query.
+        distance : float
+            Query radius.
+
+        Returns
+        -------
+        list[Unit]
+        """
+        if isinstance(type_ids, UnitID):
+            type_ids = {type_ids}
+        x, y = position
+        min_cx, min_cy = _cell(x - distance, y - distance)
+        max_cx, max_cy = _cell(x + distance, y + distance)
+        distance_sq: float = distance * distance
+        found: list[Unit] = []
+        for type_id in type_ids:
+            cells: dict[tuple[int, int], list[Unit]] = self._cells.get(type_id)
+            if not cells:
+                continue
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    for structure in cells.get((cx, cy), ()):
+                        sx, sy = structure.position
+                        if (sx - x) ** 2 + (sy - y) ** 2 <= distance_sq:
+                            found.append(structure)
+        return found
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+from sc2.position import Point2
+from sc2.unit import Unit
+from scipy.spatial import KDTree
+
+
+@dataclass
+class UnitIndex:
+    """KD-tree over every unit on the map for a single game loop.
+
+    Parameters
+    ----------
+    game_loop : int
+        The game loop this index was built on.
+    units : list[Unit]
+        All units, row order matches `tags` and the tree.
+    tags : np.ndarray
+        Unit tags.
+    tree : KDTree | None
+        Tree over unit positions, None if there are no units.
+    """
+
+    game_loop: int
+    units: list[Unit]
+    tags: np.ndarray
+    tree: KDTree | None
+
+    @classmethod
+    def build(cls, units: Iterable[Unit], game_loop: int) -> "UnitIndex":
+        units = list(units)
+        tree: KDTree | None = None
+        if units:
+            tree = KDTree(np.array([u.position for u in units], dtype=np.float64))
+        return cls(
+            game_loop=game_loop,
+            units=units,
+            tags=np.array([u.tag for u in units], dtype=np.uint64),
+            tree=tree,
+        )
+
+    def neighbours_within(
+        self,
+        positions: list[Point2],
+        radius: float,
+        exclude_tags: set[int],
+    ) -> tuple[np.ndarray, list[Unit | None]]:
+        """Count units within `radius` of each position, ignoring `exclude_tags`.
+
+        Parameters
+        ----------
+        positions : list[Point2]
+            Query positions.
+        radius : float
+            Query radius.
+        exclude_tags : set[int]
+            Units with these tags are not counted.
+
+        Returns
+        -------
+        tuple[np.ndarray, list[Unit | None]]
+            Neighbour count per position, and the closest counted neighbour
+            per position (None when there are none).
+        """
+        counts: np.ndarray = np.zeros(len(positions), dtype=np.intp)
+        closest: list[Unit | None] = [None] * len(positions)
+        if self.tree is None or not positions:
+            return counts, closest
+
+        query: np.ndarray = np.array(positions, dtype=np.float64)
+        excluded: np.ndarray = np.isin(
+            self.tags, np.fromiter(exclude_tags, dtype=np.uint64)
+        )
+        for i, found in enumerate(self.tree.query_ball_point(query, radius)):
+            found = np.asarray(found, dtype=np.intp)
+            found = found[~excluded[found]]
+            counts[i] = len(found)
+            if len(found):
+                d_sq: np.ndarray = np.sum(
+                    (self.tree.data[found] - query[i]) ** 2, axis=1
+                )
+                closest[i] = self.units[found[np.argmin(d_sq)]]
+        return counts, closest
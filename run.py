@@ -5,11 +5,14 @@ from os import path
 from pathlib import Path
 from typing import List
 
+from bot.startup_profiler import mark, start_import_profiling
+
+# before anything else, so every import after this is timed
+start_import_profiling()
+
 from loguru import logger
-from sc2 import maps
-from sc2.data import AIBuild, Difficulty, Race
-from sc2.main import run_game
-from sc2.player import Bot, Computer
+from sc2.data import Race
+from sc2.player import Bot
 
 sys.path.append("ares-sc2/src/ares")
 sys.path.append("ares-sc2/src")
@@ -17,28 +20,14 @@ sys.path.append("ares-sc2")
 
 import yaml
 
+from bot.consts import MAP_FILE_EXT, MAPS_PATH
 from bot.main import MyBot
-from ladder import run_ladder_game
-
-plt = platform.system()
-# change if non default setup / linux
-# if having issues with this, modify `map_list` below manually
-if plt == "Windows":
-    MAPS_PATH: str = "C:\\Program Files (x86)\\StarCraft II\\Maps"
-elif plt == "Darwin":
-    MAPS_PATH: str = "/Applications/StarCraft II/Maps"
-elif plt == "Linux":
-    # path would look a bit like this on linux after installing
-    # SC2 via lutris
-    MAPS_PATH: str = (
-        "~/<username>/Games/battlenet/drive_c/Program Files (x86)/StarCraft II/Maps"
-    )
-else:
-    logger.error(f"{plt} not supported")
+
+if not MAPS_PATH:
+    logger.error(f"{platform.system()} not supported")
     sys.exit()
 
 CONFIG_FILE: str = "config.yml"
-MAP_FILE_EXT: str = "SC2Map"
 MY_BOT_NAME: str = "MyBotName"
 MY_BOT_RACE: str = "MyBotRace"
 
@@ -59,8 +48,11 @@ def main():
                 race = Race[config[MY_BOT_RACE].title()]
 
     bot1 = Bot(race, MyBot(), bot_name)
+    mark("bot created")
 
     if "--LadderServer" in sys.argv:
+        from ladder import run_ladder_game
+
         # Ladder game started by LadderManager
         print("Starting ladder game...")
         result, opponentid = run_ladder_game(bot1)
@@ -90,6 +82,12 @@ def main():
                 # "IncorporealAIE_v4",
             ]
 
+        # only needed for local play
+        from sc2 import maps
+        from sc2.data import AIBuild, Difficulty
+        from sc2.main import run_game
+        from sc2.player import Computer
+
         random_race = random.choice([Race.Zerg, Race.Terran, Race.Protoss])
         print("Starting local game...")
         run_game(
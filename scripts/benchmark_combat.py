@@ -0,0 +1,437 @@
+"""
+Offline micro benchmarks for the classes in `bot/combat`.
+
+Runs each combat class `execute` against stub bot / mediator objects and
+synthetic battles, without launching StarCraft II. Registered behaviors
+are executed straight away as Ares does, so their cost and the shared
+grid and path caches are timed too. The stub mediator answers pathing
+with straight lines, so pathfinding itself is not.
+
+Usage (from the repo root):
+    python scripts/benchmark_combat.py
+    python scripts/benchmark_combat.py --save-baseline
+    python scripts/benchmark_combat.py --check-baseline --tolerance 0.25
+
+`--check-baseline` exits with status 1 if any p50 / p90 regressed by more
+than `--tolerance` compared to the stored baseline, and with status 2
+without comparing if the baseline was saved on another machine.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from os import path
+from types import SimpleNamespace
+from typing import Any, Callable
+
+sys.path.append("ares-sc2/src/ares")
+sys.path.append("ares-sc2/src")
+sys.path.append("ares-sc2")
+sys.path.append(".")
+
+import numpy as np
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+
+from bot.combat.air_combat import AirCombat
+from bot.combat.ground_range_combat import GroundRangeCombat
+from bot.combat.path_cache import PathCache
+from bot.combat.probe_proxy_builder import ProbeProxyBuilder
+from bot.combat.worker_combat import WorkerCombat
+from bot.main import MyBot
+
+BASELINE_FILE: str = path.join("scripts", "combat_benchmark_baseline.json")
+MAP_SIZE: int = 160
+SIZES: list[int] = [10, 50, 200, 500]
+
+# type_id: radius, ground range, air range, ground dps, air dps, speed, flying
+UNIT_STATS: dict[UnitTypeId, tuple[float, float, float, float, float, float, bool]] = {
+    UnitTypeId.TEMPEST: (1.25, 10.0, 14.0, 16.9, 12.7, 3.15, True),
+    UnitTypeId.VOIDRAY: (1.0, 6.0, 6.0, 16.8, 16.8, 3.85, True),
+    UnitTypeId.STALKER: (0.625, 6.0, 6.0, 9.7, 9.7, 4.13, False),
+    UnitTypeId.PROBE: (0.375, 0.1, 0.0, 4.67, 0.0, 3.94, False),
+    UnitTypeId.MARINE: (0.375, 5.0, 5.0, 9.8, 9.8, 3.15, False),
+    UnitTypeId.MUTALISK: (0.5, 3.0, 3.0, 11.2, 11.2, 5.6, True),
+    UnitTypeId.ZERGLING: (0.375, 0.1, 0.0, 10.0, 0.0, 4.13, False),
+    UnitTypeId.PHOTONCANNON: (1.125, 7.0, 7.0, 22.4, 22.4, 0.0, False),
+    UnitTypeId.PYLON: (1.125, 0.0, 0.0, 0.0, 0.0, 0.0, False),
+}
+
+
+@dataclass
+class SyntheticUnit:
+    """Just enough of `sc2.unit.Unit` for the combat classes."""
+
+    tag: int
+    type_id: UnitTypeId
+    position: Point2
+    health: float = 100.0
+    shield: float = 50.0
+    shield_max: float = 50.0
+    facing: float = 0.0
+    weapon_cooldown: float = 0.0
+    energy: float = 0.0
+    orders: list = field(default_factory=list)
+    is_cloaked: bool = False
+    is_revealed: bool = False
+    is_burrowed: bool = False
+    is_visible: bool = True
+    is_memory: bool = False
+    is_snapshot: bool = False
+    is_hallucination: bool = False
+    is_powered: bool = True
+    is_carrying_minerals: bool = False
+
+    def __post_init__(self):
+        stats = UNIT_STATS[self.type_id]
+        (
+            self.radius,
+            self.ground_range,
+            self.air_range,
+            self.ground_dps,
+            self.air_dps,
+            self.real_speed,
+            self.is_flying,
+        ) = stats
+        self._proto = SimpleNamespace(unit_type=self.type_id.value)
+
+    @property
+    def can_attack_ground(self) -> bool:
+        return self.ground_dps > 0
+
+    @property
+    def can_attack_air(self) -> bool:
+        return self.air_dps > 0
+
+    @property
+    def can_attack(self) -> bool:
+        return self.can_attack_ground or self.can_attack_air
+
+    @property
+    def shield_percentage(self) -> float:
+        return self.shield / self.shield_max if self.shield_max else 0.0
+
+    @property
+    def distance_to_weapon_ready(self) -> float:
+        return self.weapon_cooldown
+
+    def distance_to(self, target) -> float:
+        position = target.position if hasattr(target, "tag") else target
+        return self.position.distance_to(position)
+
+    def __call__(self, *args, **kwargs) -> None:
+        pass
+
+    def attack(self, *args, **kwargs) -> None:
+        pass
+
+    def move(self, *args, **kwargs) -> None:
+        pass
+
+    def return_resource(self, *args, **kwargs) -> None:
+        pass
+
+
+class StubMediator:
+    """Mediator answering only what `bot/combat` asks for."""
+
+    def __init__(self, enemies: list[SyntheticUnit]):
+        self._enemies = enemies
+        self._enemy_positions = np.array([e.position for e in enemies])
+        grid: np.ndarray = np.ones((MAP_SIZE, MAP_SIZE), dtype=np.float32)
+        # some danger around the enemy so safety checks have work to do
+        for e in enemies[: max(1, len(enemies) // 10)]:
+            x, y = int(e.position.x), int(e.position.y)
+            grid[max(x - 4, 0) : x + 4, max(y - 4, 0) : y + 4] += 20.0
+        self.get_air_grid = grid
+        self.get_air_avoidance_grid = grid
+        self.get_ground_grid = grid
+        self.get_ground_avoidance_grid = grid
+        self.get_own_structures_dict = {}
+
+    def get_units_in_range(
+        self, start_points, distances, query_tree=None, return_as_dict=False
+    ):
+        if not isinstance(distances, list):
+            distances = [distances] * len(start_points)
+        results = []
+        for point, distance in zip(start_points, distances):
+            point = point.position if hasattr(point, "tag") else point
+            d_sq = np.sum((self._enemy_positions - np.array(point)) ** 2, axis=1)
+            results.append(
+                [self._enemies[i] for i in np.flatnonzero(d_sq <= distance**2)]
+            )
+        if return_as_dict:
+            return {p.tag: r for p, r in zip(start_points, results)}
+        return results
+
+    @staticmethod
+    def find_raw_path(start, target, grid, sensitivity: int = 1) -> list[Point2]:
+        steps: int = max(int(Point2(start).distance_to(Point2(target))), 1)
+        return [
+            Point2(
+                (
+                    start[0] + (target[0] - start[0]) * t,
+                    start[1] + (target[1] - start[1]) * t,
+                )
+            )
+            for t in np.linspace(0.0, 1.0, steps + 1)[::sensitivity]
+        ]
+
+    @staticmethod
+    def find_path_next_point(
+        start, target, grid, sensitivity: int = 5, **kwargs
+    ) -> Point2:
+        return Point2(start).towards(Point2(target), float(sensitivity))
+
+    @staticmethod
+    def is_position_safe(grid, position, weight_safety_limit: float = 1.0) -> bool:
+        return grid[int(position[0]), int(position[1])] <= weight_safety_limit
+
+    @staticmethod
+    def find_closest_safe_spot(from_pos, grid, radius: float = 15.0) -> Point2:
+        x, y = int(from_pos[0]), int(from_pos[1])
+        r: int = int(radius)
+        window: np.ndarray = grid[max(x - r, 0) : x + r, max(y - r, 0) : y + r]
+        xs, ys = np.nonzero(window <= 1.0)
+        if len(xs) == 0:
+            return from_pos
+        xs = xs + max(x - r, 0)
+        ys = ys + max(y - r, 0)
+        i = np.argmin((xs - x) ** 2 + (ys - y) ** 2)
+        return Point2((int(xs[i]), int(ys[i])))
+
+
+class StubBot:
+    """Stands in for `MyBot`, running registered behaviors as Ares does."""
+
+    # the same per game loop caches as the real bot
+    enemy_snapshot = MyBot.enemy_snapshot
+    grid_snapshot = MyBot.grid_snapshot
+    structure_index = MyBot.structure_index
+
+    def __init__(self, own: list[SyntheticUnit], enemies: list[SyntheticUnit]):
+        self.state = SimpleNamespace(game_loop=0)
+        self.client = SimpleNamespace(game_step=2)
+        self.all_enemy_units = enemies
+        self.enemy_structures = [e for e in enemies if e.ground_range == 0.0]
+        self.structures = []
+        self.units = own
+        self.enemy_start_locations = [Point2((MAP_SIZE - 20, MAP_SIZE - 20))]
+        self.time = 180.0
+        self.config = {}
+        self.mediator = StubMediator(enemies)
+        self.path_cache: PathCache = PathCache()
+        self._enemy_snapshot = None
+        self._grid_snapshot = None
+        self._structure_index = None
+        self.behaviors: list[Any] = []
+
+    def register_behavior(self, behavior) -> None:
+        self.behaviors.append(behavior)
+        behavior.execute(self, self.config, self.mediator)
+
+
+def _units(
+    type_ids: list[UnitTypeId], count: int, centre: Point2, spread: float, tag: int
+) -> list[SyntheticUnit]:
+    return [
+        SyntheticUnit(
+            tag=tag + i,
+            type_id=type_ids[i % len(type_ids)],
+            position=Point2(
+                (
+                    centre.x + random.uniform(-spread, spread),
+                    centre.y + random.uniform(-spread, spread),
+                )
+            ),
+            shield=random.uniform(0.0, 50.0),
+        )
+        for i in range(count)
+    ]
+
+
+@dataclass
+class Scenario:
+    name: str
+    combat_cls: type
+    own_types: list[UnitTypeId]
+    enemy_types: list[UnitTypeId]
+    kwargs: Callable[[StubBot, list[SyntheticUnit]], dict]
+
+
+SCENARIOS: list[Scenario] = [
+    Scenario(
+        "AirCombat",
+        AirCombat,
+        [UnitTypeId.TEMPEST, UnitTypeId.VOIDRAY],
+        [UnitTypeId.MARINE, UnitTypeId.MUTALISK, UnitTypeId.PHOTONCANNON],
+        lambda ai, own: {
+            "all_close_enemy": ai.all_enemy_units,
+            "target": ai.enemy_start_locations[0],
+        },
+    ),
+    Scenario(
+        "GroundRangeCombat",
+        GroundRangeCombat,
+        [UnitTypeId.STALKER],
+        [UnitTypeId.MARINE, UnitTypeId.ZERGLING, UnitTypeId.PYLON],
+        lambda ai, own: {"target": ai.enemy_start_locations[0]},
+    ),
+    Scenario(
+        "WorkerCombat",
+        WorkerCombat,
+        [UnitTypeId.PROBE],
+        [UnitTypeId.PROBE, UnitTypeId.PYLON],
+        lambda ai, own: {
+            "all_close_enemy": ai.all_enemy_units,
+            "target": ai.enemy_start_locations[0],
+        },
+    ),
+    Scenario(
+        "ProbeProxyBuilder",
+        ProbeProxyBuilder,
+        [UnitTypeId.PROBE],
+        [UnitTypeId.ZERGLING],
+        lambda ai, own: {
+            "target": ai.enemy_start_locations[0],
+            "primary_builder_tag": own[0].tag,
+            "next_item_to_build": None,
+            "build_location": None,
+        },
+    ),
+]
+
+
+def run_scenario(scenario: Scenario, size: int, iterations: int) -> dict:
+    random.seed(size)
+    centre: Point2 = Point2((MAP_SIZE / 2, MAP_SIZE / 2))
+    own = _units(scenario.own_types, size, centre.offset((-4, 0)), 6.0, 1)
+    enemies = _units(scenario.enemy_types, size, centre.offset((4, 0)), 8.0, 100_000)
+    ai = StubBot(own, enemies)
+    combat = scenario.combat_cls(ai, ai.config, ai.mediator)
+    kwargs: dict = scenario.kwargs(ai, own)
+
+    def call() -> None:
+        # new game loop each call, so per frame caches are rebuilt
+        ai.state.game_loop += 1
+        ai.behaviors.clear()
+        combat.execute(own, **kwargs)
+
+    for _ in range(min(5, iterations)):
+        call()
+
+    timings: list[float] = []
+    for _ in range(iterations):
+        start: int = time.perf_counter_ns()
+        call()
+        timings.append((time.perf_counter_ns() - start) / 1e6)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    call()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    alloc_blocks: int = sum(
+        max(stat.count_diff, 0) for stat in after.compare_to(before, "lineno")
+    )
+
+    p50, p90, p99 = np.percentile(timings, [50, 90, 99])
+    return {
+        "p50_ms": round(float(p50), 4),
+        "p90_ms": round(float(p90), 4),
+        "p99_ms": round(float(p99), 4),
+        "alloc_blocks": alloc_blocks,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def _machine() -> dict[str, str]:
+    """Where the timings come from, baselines only compare on one machine."""
+    return {
+        "processor": platform.processor() or platform.machine(),
+        "system": platform.system(),
+        "python": platform.python_version(),
+    }
+
+
+def check_regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions: list[str] = []
+    for name, sizes in results.items():
+        for size, stats in sizes.items():
+            base: dict | None = baseline.get(name, {}).get(size)
+            if not base:
+                continue
+            for key in ("p50_ms", "p90_ms"):
+                if stats[key] > base[key] * (1.0 + tolerance):
+                    regressions.append(
+                        f"{name} @ {size}: {key} {stats[key]:.3f} "
+                        f"> baseline {base[key]:.3f}"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--only", type=str, nargs="+", help="Scenario names to run")
+    parser.add_argument("--baseline", type=str, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, dict]] = {}
+    print(
+        f"{'scenario':<20}{'size':>6}{'p50 ms':>10}{'p90 ms':>10}"
+        f"{'p99 ms':>10}{'blocks':>10}{'peak KiB':>10}"
+    )
+    for scenario in SCENARIOS:
+        if args.only and scenario.name not in args.only:
+            continue
+        results[scenario.name] = {}
+        for size in args.sizes:
+            stats: dict = run_scenario(scenario, size, args.iterations)
+            results[scenario.name][str(size)] = stats
+            print(
+                f"{scenario.name:<20}{size:>6}{stats['p50_ms']:>10.3f}"
+                f"{stats['p90_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+                f"{stats['alloc_blocks']:>10}{stats['peak_kib']:>10.1f}"
+            )
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": _machine(), "results": results}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.check_baseline:
+        if not path.isfile(args.baseline):
+            print(f"No baseline at {args.baseline}, run with --save-baseline first")
+            sys.exit(1)
+        with open(args.baseline) as f:
+            baseline: dict = json.load(f)
+        if baseline.get("machine") != _machine():
+            print(
+                f"Baseline was saved on {baseline.get('machine')}, this is "
+                f"{_machine()}, save a baseline on this machine to compare"
+            )
+            sys.exit(2)
+        if regressions := check_regressions(
+            results, baseline.get("results", {}), args.tolerance
+        ):
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Prebuild `bot/data/map_cache.json`, the proxy paths the openings would
+otherwise compute with live pathfinding at the start of every game.
+
+Plays a very short game on each map, the bot works out the paths for its
+spawn and leaves straight away. Spawns are random, so each map is played
+until every start location has an entry or `--games-per-map` is reached.
+
+Run from the repository root:
+
+    python scripts/build_map_cache.py
+    python scripts/build_map_cache.py --maps PersephoneAIE_v4 --games-per-map 4
+    python scripts/build_map_cache.py --maps-dir ~/StarCraftII/Maps
+"""
+
+import argparse
+import sys
+from os import path
+from pathlib import Path
+
+sys.path.append("ares-sc2/src/ares")
+sys.path.append("ares-sc2/src")
+sys.path.append("ares-sc2")
+sys.path.append(path.abspath("."))
+
+from ares import AresBot
+from loguru import logger
+from sc2 import maps
+from sc2.data import Difficulty, Race
+from sc2.main import run_game
+from sc2.player import Bot, Computer
+
+from bot.consts import MAP_FILE_EXT, MAPS_PATH
+from bot.map_cache import CACHE_FILE, ProxyPaths, load_cache, map_key, save_cache
+
+
+class MapCacheBuilder(AresBot):
+    """Computes this game's proxy paths on the first step, then leaves."""
+
+    def __init__(self, cache: dict[str, dict]):
+        super().__init__()
+        self.cache: dict[str, dict] = cache
+        self.key: str = ""
+        self.spawns_on_map: int = 0
+
+    async def on_step(self, iteration: int) -> None:
+        await super(MapCacheBuilder, self).on_step(iteration)
+        self.key = map_key(self)
+        self.cache[self.key] = ProxyPaths.live(self).to_json()
+        self.spawns_on_map = len(self.enemy_start_locations) + 1
+        logger.info(f"Cached {self.key}")
+        await self.client.leave()
+
+
+def _cached_spawns(cache: dict[str, dict], map_name: str) -> int:
+    return len({key for key in cache if key.startswith(f"{map_name}|")})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--maps",
+        nargs="*",
+        help="Map names, defaults to every map found in --maps-dir",
+    )
+    parser.add_argument(
+        "--maps-dir",
+        default=MAPS_PATH,
+        help="Where to look for maps, defaults to bot.consts.MAPS_PATH",
+    )
+    parser.add_argument("--games-per-map", type=int, default=6)
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Start from an empty cache"
+    )
+    args = parser.parse_args()
+
+    map_names: list[str] = args.maps or [
+        p.name.replace(f".{MAP_FILE_EXT}", "")
+        for p in Path(args.maps_dir).expanduser().glob(f"*.{MAP_FILE_EXT}")
+        if p.is_file()
+    ]
+    if not map_names:
+        logger.error(f"No maps found in {args.maps_dir}, pass them with --maps")
+        sys.exit(1)
+
+    cache: dict[str, dict] = {} if args.rebuild else load_cache()
+    for map_name in map_names:
+        for _ in range(args.games_per_map):
+            builder: MapCacheBuilder = MapCacheBuilder(cache)
+            run_game(
+                maps.get(map_name),
+                [
+                    Bot(Race.Protoss, builder),
+                    Computer(Race.Protoss, Difficulty.VeryEasy),
+                ],
+                realtime=False,
+            )
+            if not builder.key:
+                logger.warning(f"No entry from {map_name}, skipping it")
+                break
+            # the game's map name can differ from the file name
+            reported_name: str = builder.key.split("|")[0]
+            if _cached_spawns(cache, reported_name) >= builder.spawns_on_map:
+                break
+        save_cache(cache)
+
+    logger.info(f"Saved {len(cache)} entries to {CACHE_FILE}")
+
+
+if __name__ == "__main__":
+    main()